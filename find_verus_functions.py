@@ -13,63 +13,305 @@ Features:
 """
 
 import re
+import io
+import os
 import json
+import mmap
+import bisect
+import functools
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    # Optional: much faster serialization of large JSON results
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# The source scanner works on UTF-8 bytes, so its patterns are bytes patterns.
+# Pattern to match any function definition with capture groups for keywords and name
+_ALL_FN_RE = re.compile(rb'(?:pub\s+)?((?:spec|proof|exec|open|uninterp|const)\s+)*fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
+# Line and block comments, removed together in a single pass
+_COMMENT_RE = re.compile(rb'//[^\n]*|/\*.*?\*/', re.DOTALL)
+_NEWLINE_RE = re.compile(rb'\n')
+# Start of a verus macro block, up to and including its opening brace
+_VERUS_START_RE = re.compile(rb'\bverus!\s*\{')
+# Tokens that matter when matching braces: comment/string openers and braces
+_BRACE_TOKEN_RE = re.compile(rb'/\*|//|"|\{|\}')
+# Remainder of a string literal after its opening quote
+_STRING_REST_RE = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+# ANSI color/style escape sequences, stripped from compiler output
+_ANSI_ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*m')
+# Error count of each "verification results::" summary line ('' if it has none)
+_VERIF_SUMMARY_RE = re.compile(r'verification results::(?:[^\n]*?, (\d+) errors?)?')
+# Line prefixes that continue the current compilation error or warning
+_ERROR_CONTINUATION_PREFIXES = ('|', '^', '=', 'Caused by:', '(signal:', "  process didn't exit successfully:")
+_WARNING_CONTINUATION_PREFIXES = ('|', '^', '=')
+
+# Directory scans with more files than this are analyzed in parallel
+_PARALLEL_MIN_FILES = 16
+# Files larger than this (in bytes) are memory-mapped rather than read into memory
+_MMAP_MIN_SIZE = 64 * 1024
+# Function keywords that mark a Verus construct rather than a regular function
+_VERUS_FN_KEYWORDS = frozenset((b'spec', b'proof', b'exec', b'open', b'uninterp'))
+
+
+def _functions_only_result(all_functions, functions_by_file):
+    """Build the JSON result for a run that only lists functions.
+    
+    The nested containers are created fresh on every call, so no two results
+    share mutable state.
+    """
+    return {
+        "status": "functions_only",
+        "summary": {
+            "total_functions": len(all_functions),
+            "verified_functions": 0,
+            "failed_functions": 0,
+            "compilation_errors": 0,
+            "compilation_warnings": 0,
+            "verification_errors": 0
+        },
+        "compilation": {
+            "errors": [],
+            "warnings": []
+        },
+        "verification": {
+            "verified_functions": [],
+            "failed_functions": [],
+            "errors": []
+        },
+        "all_functions": all_functions,
+        "functions_by_file": functions_by_file
+    }
+
+
+def _json_bytes(obj):
+    """Serialize obj as 2-space indented JSON, encoded as UTF-8 bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # e.g. surrogate-escaped non-UTF-8 paths, which json.dumps escapes
+            pass
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def _read_output_file(path):
+    """Read a verification log as text in one binary read and one decode pass.
+    
+    Newlines are normalized as text-mode reading would; undecodable bytes
+    are replaced rather than rejecting the whole log.
+    """
+    content = Path(path).read_bytes().decode('utf-8', errors='replace')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _function_names(all_functions_with_lines):
+    """Return the set of distinct function names in a file -> [(name, line), ...] mapping."""
+    return set(map(itemgetter(0), chain.from_iterable(all_functions_with_lines.values())))
+
+
+def _functions_by_file(all_functions_with_lines):
+    """Build the JSON "functions_by_file" mapping of file -> [{"name", "line"}, ...].
+    
+    The per-function dicts are part of the output schema. Their keys are
+    string literals, so every row already shares the same interned key
+    objects; only the values differ. File paths are already str keys (see
+    RustFunctionFinder.find_all_functions), so they are used as-is.
+    """
+    return {
+        file_path: [{"name": func_name, "line": line_num} for func_name, line_num in functions]
+        for file_path, functions in all_functions_with_lines.items()
+    }
+
+
+def _function_inventory(all_functions_with_lines):
+    """Return (function names, JSON "functions_by_file" mapping) built in a single pass."""
+    function_names = set()
+    functions_by_file = {}
+    for file_path, functions in all_functions_with_lines.items():
+        functions_by_file[file_path] = [{"name": func_name, "line": line_num} for func_name, line_num in functions]
+        function_names.update(map(itemgetter(0), functions))
+    return function_names, functions_by_file
+
+
+def _newline_offsets(content):
+    """Return the sorted offsets of every newline in content, for bisect-based line lookup."""
+    return [m.start() for m in _NEWLINE_RE.finditer(content)]
+
+
+def _find_matching_brace(content, start_pos):
+    """Return the offset of the brace closing the one at start_pos, or -1.
+    
+    content is bytes or an mmap. String literals and comments are skipped.
+    This is the scanner's hot loop, so the regex methods and find are bound
+    to locals up front.
+    """
+    search = _BRACE_TOKEN_RE.search
+    match_string_rest = _STRING_REST_RE.match
+    find = content.find
+    brace_count = 0
+    i = start_pos
+    
+    # Jump from one interesting token to the next instead of walking every character
+    while True:
+        match = search(content, i)
+        if not match:
+            break
+        token = match.group()
+        i = match.end()
+        if token == b'{':
+            brace_count += 1
+        elif token == b'}':
+            brace_count -= 1
+            if brace_count == 0:
+                return match.start()
+        elif token == b'"':
+            # Skip string literals (including escaped characters)
+            string_end = match_string_rest(content, i)
+            if not string_end:
+                break
+            i = string_end.end()
+        elif token == b'/*':
+            # Skip block comments
+            comment_end = find(b'*/', i)
+            if comment_end == -1:
+                break
+            i = comment_end + 2
+        else:
+            # Skip line comments
+            line_end = find(b'\n', i)
+            if line_end == -1:
+                break
+            i = line_end + 1
+    
+    return -1  # No matching brace found
+
+
+def _find_verus_blocks(content, verus_start_pattern=_VERUS_START_RE):
+    """Return (start, end, start_line) for each verus! block in content (bytes or mmap).
+    
+    start is the offset of 'verus!', end the offset of its closing brace and
+    start_line the 1-based line of start. Scanning stops at the first
+    unterminated block. Line numbers are counted incrementally between
+    blocks, so no per-file newline table is needed.
+    """
+    blocks = []
+    search = verus_start_pattern.search
+    pos = 0
+    line = 1
+    counted_to = 0
+    
+    while True:
+        match = search(content, pos)
+        if not match:
+            break
+        start = match.start()
+        # The pattern ends at the block's opening '{'
+        end = _find_matching_brace(content, match.end() - 1)
+        if end == -1:
+            break  # Malformed block
+        # mmap has no count(), so count newlines on the (short) gap slice
+        line += content[counted_to:start].count(b'\n')
+        counted_to = start
+        blocks.append((start, end, line))
+        pos = end + 1
+    
+    return blocks
+
 
 class CompilationErrorParser:
-    def __init__(self):
-        # Pattern to match compilation errors - improved for Cargo output
-        self.error_pattern = re.compile(r'error(?:\[E\d+\])?: (.+)')
-        self.cargo_error_pattern = re.compile(r'error: could not compile `([^`]+)`')
-        self.warning_pattern = re.compile(r'warning: (.+)')
-        self.file_location_pattern = re.compile(r'-->\s+([^:]+):(\d+):(\d+)')
-        self.process_error_pattern = re.compile(r"process didn't exit successfully: (.+)")
-        self.memory_error_pattern = re.compile(r'memory allocation of \d+ bytes failed')
-        self.caused_by_pattern = re.compile(r'Caused by:')
-        self.exit_status_pattern = re.compile(r'\(exit status: (\d+)\)')
-        self.verus_command_exit_pattern = re.compile(r'Verus command completed with exit code: (\d+)')
-        # Pattern to detect verification results summary
-        self.verification_results_pattern = re.compile(r'verification results::\s*(\d+)\s+verified,\s*(\d+)\s+errors?')
-        # Verification-specific error patterns that should NOT be treated as compilation errors
-        self.verification_error_patterns = [
-            re.compile(r'error: assertion failed'),
-            re.compile(r'error: postcondition not satisfied'),
-            re.compile(r'error: precondition not satisfied'),
-            re.compile(r'error: loop invariant not preserved'),
-            re.compile(r'error: loop invariant not satisfied on entry'),
-            re.compile(r'error: assertion not satisfied'),
-        ]
-        
+    # Patterns are compiled once at class level and shared by all instances.
+    # Pattern to match compilation errors - improved for Cargo output
+    error_pattern = re.compile(r'error(?:\[E\d+\])?: (.+)')
+    cargo_error_pattern = re.compile(r'error: could not compile `([^`]+)`')
+    warning_pattern = re.compile(r'warning: (.+)')
+    file_location_pattern = re.compile(r'-->\s+([^:]+):(\d+):(\d+)')
+    process_error_pattern = re.compile(r"process didn't exit successfully: (.+)")
+    memory_error_pattern = re.compile(r'memory allocation of \d+ bytes failed')
+    caused_by_pattern = re.compile(r'Caused by:')
+    exit_status_pattern = re.compile(r'\(exit status: (\d+)\)')
+    verus_command_exit_pattern = re.compile(r'Verus command completed with exit code: (\d+)')
+    # Pattern to detect verification results summary
+    verification_results_pattern = re.compile(r'verification results::\s*(\d+)\s+verified,\s*(\d+)\s+errors?')
+    # Verification-specific error patterns that should NOT be treated as compilation errors
+    verification_error_patterns = [
+        re.compile(r'error: assertion failed'),
+        re.compile(r'error: postcondition not satisfied'),
+        re.compile(r'error: precondition not satisfied'),
+        re.compile(r'error: loop invariant not preserved'),
+        re.compile(r'error: loop invariant not satisfied on entry'),
+        re.compile(r'error: assertion not satisfied'),
+    ]
+    # The patterns above as one alternation, so a line needs one search
+    verification_error_pattern = re.compile('|'.join(p.pattern for p in verification_error_patterns))
+    # All line kinds above combined into one pattern. Each alternative is
+    # anchored with a lazy ".*?" so that alternatives are tried in priority
+    # order (as the separate searches used to be) rather than by position;
+    # match.lastgroup names the kind that matched.
+    line_pattern = re.compile(
+        r'.*?(?P<results>verification results::\s*\d+\s+verified,\s*\d+\s+errors?)'
+        r'|.*?(?P<cargo>error: could not compile `(?P<crate>[^`]+)`)'
+        r'|.*?(?P<memory>memory allocation of \d+ bytes failed)'
+        r'|.*?(?P<verus_exit>Verus command completed with exit code: (?P<exit_code>\d+))'
+        r"|.*?(?P<process>process didn't exit successfully: (?P<process_detail>.+))"
+        r'|.*?(?P<error>error(?:\[E\d+\])?: (?P<error_message>.+))'
+        r'|.*?(?P<warning>warning: (?P<warning_message>.+))'
+        r'|.*?(?P<location>-->\s+(?P<location_file>[^:]+):(?P<location_line>\d+):(?P<location_column>\d+))'
+    )
+    
+    @staticmethod
+    def _may_classify(line):
+        """Cheap literal pre-check: can line_pattern match this line at all?"""
+        return ('error' in line or 'warning: ' in line or '-->' in line or
+                'memory allocation' in line or "process didn't" in line or 'Verus command' in line)
+    
     def parse_compilation_output(self, output_content):
         """Parse compilation output and extract errors and warnings."""
         errors = []
         warnings = []
         current_error = None
         current_warning = None
-        has_verification_results = False
         
-        lines = output_content.split('\n')
+        # Check up front whether we have verification results
+        has_verification_results = self.has_verification_results(output_content)
         
-        # First pass: check if we have verification results
-        for line in lines:
-            line = line.strip()
-            if self.verification_results_pattern.search(line):
-                has_verification_results = True
-                break
-        
-        for i, line in enumerate(lines):
+        # Iterate lines lazily rather than materializing a list of all lines
+        for line in io.StringIO(output_content):
             line = line.strip()
             
+            if not line:
+                # Empty line might end current error/warning context
+                if current_error and len(current_error["full_message"]) > 0:
+                    errors.append(current_error)
+                    current_error = None
+                if current_warning and len(current_warning["full_message"]) > 0:
+                    warnings.append(current_warning)
+                    current_warning = None
+                continue
+            
+            # One ordered match classifies the line; lines without any of the
+            # literals the patterns need (most context/progress lines) skip it
+            match = self.line_pattern.match(line) if self._may_classify(line) else None
+            kind = match.lastgroup if match else None
+            
             # Check for verification results summary - this indicates successful verification run
-            verification_results_match = self.verification_results_pattern.search(line)
-            if verification_results_match:
+            if kind == 'results':
                 # This is a verification results line, not a compilation error
                 continue
             
             # Check for cargo compilation errors
-            cargo_error_match = self.cargo_error_pattern.search(line)
-            if cargo_error_match:
+            if kind == 'cargo':
                 # If we have verification results, this "could not compile" might be
                 # just a side effect of verification failures, not a true compilation error
                 if has_verification_results:
@@ -79,19 +321,20 @@ class CompilationErrorParser:
                 if current_error:
                     errors.append(current_error)
                 current_error = {
-                    "message": f"Compilation failed for crate: {cargo_error_match.group(1)}",
+                    "message": None,
                     "file": None,
                     "line": None,
                     "column": None,
-                    "full_message": [line]
+                    "full_message": [line],
+                    "message_parts": [f"Compilation failed for crate: {match.group('crate')}"]
                 }
                 continue
                 
             # Check for memory allocation errors
-            if self.memory_error_pattern.search(line):
+            if kind == 'memory':
                 if current_error:
                     current_error["full_message"].append(line)
-                    current_error["message"] += f" - {line}"
+                    current_error["message_parts"].append(f" - {line}")
                 else:
                     errors.append({
                         "message": line,
@@ -103,44 +346,43 @@ class CompilationErrorParser:
                 continue
                 
             # Check for Verus command exit code messages
-            verus_exit_match = self.verus_command_exit_pattern.search(line)
-            if verus_exit_match:
-                exit_code = int(verus_exit_match.group(1))
+            if kind == 'verus_exit':
+                exit_code = int(match.group('exit_code'))
                 if current_error:
                     current_error["full_message"].append(line)
-                    current_error["message"] += f" (exit code: {exit_code})"
+                    current_error["message_parts"].append(f" (exit code: {exit_code})")
                 else:
                     current_error = {
-                        "message": f"Verus command failed with exit code {exit_code}",
+                        "message": None,
                         "file": None,
                         "line": None,
                         "column": None,
-                        "full_message": [line]
+                        "full_message": [line],
+                        "message_parts": [f"Verus command failed with exit code {exit_code}"]
                     }
                 continue
             
             # Check for process failure errors
-            process_error_match = self.process_error_pattern.search(line)
-            if process_error_match:
+            if kind == 'process':
                 if current_error:
                     current_error["full_message"].append(line)
                     # Extract more detailed process information
-                    current_error["message"] += f" - {process_error_match.group(1)}"
+                    current_error["message_parts"].append(f" - {match.group('process_detail')}")
                 else:
                     current_error = {
-                        "message": f"Process execution failed: {process_error_match.group(1)}",
+                        "message": None,
                         "file": None,
                         "line": None,
                         "column": None,
-                        "full_message": [line]
+                        "full_message": [line],
+                        "message_parts": [f"Process execution failed: {match.group('process_detail')}"]
                     }
                 continue
             
             # Check for standard error format
-            error_match = self.error_pattern.search(line)
-            if error_match:
+            if kind == 'error':
                 # Check if this is a verification-specific error that should not be treated as compilation error
-                is_verification_error = any(pattern.search(line) for pattern in self.verification_error_patterns)
+                is_verification_error = self.verification_error_pattern.search(line) is not None
                 
                 if is_verification_error:
                     # Skip verification errors when parsing compilation errors
@@ -149,21 +391,21 @@ class CompilationErrorParser:
                 if current_error:
                     errors.append(current_error)
                 current_error = {
-                    "message": error_match.group(1).strip(),
+                    "message": None,
                     "file": None,
                     "line": None,
                     "column": None,
-                    "full_message": [line]
+                    "full_message": [line],
+                    "message_parts": [match.group('error_message').strip()]
                 }
                 continue
                 
             # Check for warning
-            warning_match = self.warning_pattern.search(line)
-            if warning_match:
+            if kind == 'warning':
                 if current_warning:
                     warnings.append(current_warning)
                 current_warning = {
-                    "message": warning_match.group(1).strip(),
+                    "message": match.group('warning_message').strip(),
                     "file": None,
                     "line": None,
                     "column": None,
@@ -172,11 +414,10 @@ class CompilationErrorParser:
                 continue
                 
             # Check for file location
-            location_match = self.file_location_pattern.search(line)
-            if location_match:
-                file_path = location_match.group(1)
-                line_num = int(location_match.group(2))
-                column = int(location_match.group(3))
+            if kind == 'location':
+                file_path = match.group('location_file')
+                line_num = int(match.group('location_line'))
+                column = int(match.group('location_column'))
                 
                 if current_error:
                     current_error["file"] = file_path
@@ -191,36 +432,34 @@ class CompilationErrorParser:
                 continue
                 
             # Add continuation lines to current error/warning
-            if current_error and (line.startswith('|') or line.startswith('^') or line.startswith('=') or 
-                                line.startswith('Caused by:') or line.startswith('(signal:') or 
-                                line.startswith('  process didn\'t exit successfully:') or 
-                                self.exit_status_pattern.search(line)):
+            # The literal check keeps the exit-status regex off ordinary context lines
+            if current_error and (line.startswith(_ERROR_CONTINUATION_PREFIXES) or
+                                  ('(exit status: ' in line and self.exit_status_pattern.search(line))):
                 current_error["full_message"].append(line)
                 # Update message with additional context
                 if line.startswith('Caused by:'):
-                    current_error["message"] += f" - {line.strip()}"
+                    current_error["message_parts"].append(f" - {line.strip()}")
                 elif '(signal:' in line:
-                    current_error["message"] += f" - {line.strip()}"
-                elif self.exit_status_pattern.search(line):
+                    current_error["message_parts"].append(f" - {line.strip()}")
+                else:
                     exit_match = self.exit_status_pattern.search(line)
                     if exit_match:
-                        current_error["message"] += f" (exit status: {exit_match.group(1)})"
-            elif current_warning and (line.startswith('|') or line.startswith('^') or line.startswith('=')):
+                        current_error["message_parts"].append(f" (exit status: {exit_match.group(1)})")
+            elif current_warning and line.startswith(_WARNING_CONTINUATION_PREFIXES):
                 current_warning["full_message"].append(line)
-            elif line == "":
-                # Empty line might end current error/warning context
-                if current_error and len(current_error["full_message"]) > 0:
-                    errors.append(current_error)
-                    current_error = None
-                if current_warning and len(current_warning["full_message"]) > 0:
-                    warnings.append(current_warning)
-                    current_warning = None
         
         # Don't forget the last error/warning
         if current_error:
             errors.append(current_error)
         if current_warning:
             warnings.append(current_warning)
+        
+        # Build error messages from their accumulated fragments in one join
+        # rather than by repeated string concatenation while parsing
+        for error in errors:
+            message_parts = error.pop("message_parts", None)
+            if message_parts is not None:
+                error["message"] = "".join(message_parts)
             
         return errors, warnings
     
@@ -229,75 +468,149 @@ class CompilationErrorParser:
         return self.verification_results_pattern.search(output_content) is not None
 
 
-class VerificationParser:
-    def __init__(self):
-        # Pattern to match error lines with file path and line number
-        # Example: "   --> curve25519-dalek/src/backend/serial/u64/field_verus.rs:446:20"
-        self.error_pattern = re.compile(r'-->\s+([^:]+):(\d+):\d+')
-        
-        # Pattern to match verification failure indicators
-        self.verification_failure_pattern = re.compile(r'error.*assertion failed')
-        self.verification_error_types = [
-            'assertion failed',
-            'postcondition not satisfied', 
-            'precondition not satisfied',
-            'loop invariant not preserved',
-            'loop invariant not satisfied on entry',
-            'assertion not satisfied'
+class FunctionLineIndex:
+    """Precomputed lookups used by VerificationParser.find_function_at_line."""
+    
+    def __init__(self, all_functions_with_lines):
+        self.all_functions_with_lines = all_functions_with_lines
+        # Normalized path and basename of every file key, computed once, and the
+        # file key resolved for each error path, memoized across lookups
+        self._file_keys = [
+            (file_key, str(Path(file_key)), Path(file_key).name)
+            for file_key in all_functions_with_lines
         ]
+        # Normalized path -> first file key with that path, for O(1) exact matches
+        self._file_keys_by_path = {}
+        for file_key, file_key_normalized, _ in self._file_keys:
+            self._file_keys_by_path.setdefault(file_key_normalized, file_key)
+        self._file_match_cache = {}
+        # Per-file (lines, names) arrays sorted by line, built on first lookup
+        self._line_tables = {}
+    
+    def match_file(self, file_path):
+        """Return the file key matching file_path, or None if no file matches."""
+        if file_path in self._file_match_cache:
+            return self._file_match_cache[file_path]
+        
+        file_path_normalized = str(Path(file_path))
+        
+        # A key naming exactly this file is the best possible match
+        matching_file = self._file_keys_by_path.get(file_path_normalized)
+        
+        if matching_file is None:
+            # Otherwise keys are tried in order and the first one that matches wins.
+            # Suffix matches (relative vs absolute paths) are special cases of the
+            # containment check; as a last resort match on the filename alone.
+            file_name = Path(file_path).name
+            for file_key, file_key_normalized, file_key_name in self._file_keys:
+                if (file_path_normalized in file_key_normalized or file_key_normalized in file_path_normalized
+                        or file_name == file_key_name):
+                    matching_file = file_key
+                    break
+        
+        self._file_match_cache[file_path] = matching_file
+        return matching_file
+    
+    def function_at_line(self, file_key, line_number):
+        """Return the function in file_key closest above (or at) line_number, or None."""
+        line_table = self._line_tables.get(file_key)
+        if line_table is None:
+            line_table = self._line_tables[file_key] = self._build_line_table(file_key)
+        lines, names = line_table
+        
+        idx = bisect.bisect_right(lines, line_number) - 1
+        if idx >= 0 and lines[idx] > 0:
+            return names[idx]
+        return None
+    
+    def _build_line_table(self, file_key):
+        """Sort a file's functions by line into parallel line/name arrays for bisect.
+        
+        Lines are kept in a compact array of C ints, which bisect searches directly.
+        """
+        lines = array('i')
+        names = []
+        # sorted() is stable, so when several functions share a line the first
+        # one listed is kept, matching the original linear scan
+        for func_name, func_line in sorted(self.all_functions_with_lines[file_key], key=lambda func: func[1]):
+            if lines and lines[-1] == func_line:
+                continue
+            lines.append(func_line)
+            names.append(func_name)
+        return lines, names
+
+
+class VerificationParser:
+    # Pattern to match error lines with file path and line number
+    # Example: "   --> curve25519-dalek/src/backend/serial/u64/field_verus.rs:446:20"
+    error_pattern = re.compile(r'-->\s+([^:]+):(\d+):\d+')
+    
+    # Pattern to match verification failure indicators
+    verification_failure_pattern = re.compile(r'error.*assertion failed')
+    verification_error_types = [
+        'assertion failed',
+        'postcondition not satisfied', 
+        'precondition not satisfied',
+        'loop invariant not preserved',
+        'loop invariant not satisfied on entry',
+        'assertion not satisfied'
+    ]
+    # Matches a line containing any of the error types above
+    verification_error_type_pattern = re.compile('|'.join(map(re.escape, verification_error_types)))
     
     def parse_verification_output(self, output_file_path):
         """Parse verification output and extract files with errors and their line numbers."""
         try:
-            with open(output_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except (FileNotFoundError, UnicodeDecodeError, PermissionError):
+            # Stream the file line by line instead of reading it into memory;
+            # undecodable bytes are replaced rather than discarding the whole log
+            with open(output_file_path, 'r', encoding='utf-8', errors='replace') as f:
+                return self.parse_verification_lines(f)
+        except (FileNotFoundError, PermissionError):
             return {}
-        
-        return self.parse_verification_output_from_content(content)
 
     def parse_verification_output_from_content(self, output_content):
         """Parse verification output content and extract files with errors and their line numbers."""
+        return self.parse_verification_lines(io.StringIO(output_content))
+
+    def parse_verification_lines(self, lines):
+        """Extract files with errors and their line numbers from an iterable of output lines."""
         errors_by_file = {}
-        lines = output_content.split('\n')
+        # (line index, is_error) of the context events among the previous lines.
+        # A 10-line window holds at most 10 events, so older ones fall off.
+        recent_events = deque(maxlen=10)
         
         for i, line in enumerate(lines):
             match = self.error_pattern.search(line)
             if match:
-                file_path = match.group(1)
-                line_number = int(match.group(2))
-                
-                # Check if this is an actual error location, not just a note
-                # Look at the previous lines to see if there's an actual error message
-                is_actual_error = False
-                
-                # Look back up to 10 lines to find context
-                for j in range(max(0, i - 10), i):
-                    prev_line = lines[j].strip()
-                    
-                    # If we find an actual error indicator, this is a real error
-                    if prev_line.startswith('error:') or prev_line.startswith('error['):
-                        # Additional check: make sure it's not a verification-specific note
-                        if not (prev_line.startswith('note:') or 'has been running for' in prev_line or 
-                               'finished in' in prev_line or 'check has been running' in prev_line or
-                               'check finished in' in prev_line):
-                            is_actual_error = True
-                            break
-                    
-                    # If we encounter a note line that's clearly informational, skip this location
-                    if (prev_line.startswith('note:') and 
-                        ('has been running for' in prev_line or 'finished in' in prev_line or
-                         'check has been running' in prev_line or 'check finished in' in prev_line)):
-                        is_actual_error = False
-                        break
-                
-                if is_actual_error:
-                    if file_path not in errors_by_file:
-                        errors_by_file[file_path] = []
-                    errors_by_file[file_path].append(line_number)
+                # Forget context events from more than 10 lines back
+                while recent_events and recent_events[0][0] < i - 10:
+                    recent_events.popleft()
+                # The earliest event in the window decides: an error message marks
+                # an actual error location, an informational note a non-error one
+                if recent_events and recent_events[0][1]:
+                    errors_by_file.setdefault(match.group(1), []).append(int(match.group(2)))
+            
+            event = self._context_event(line.strip())
+            if event is not None:
+                recent_events.append((i, event))
         
         return errors_by_file
 
+    @staticmethod
+    def _context_event(line):
+        """Classify a stripped line as context for later location lines.
+        
+        Returns True for an error message, False for an informational note
+        (e.g. "note: check has been running for ..."), and None otherwise.
+        """
+        # "check has been running" and "check finished in" are covered by these two
+        is_progress = 'has been running for' in line or 'finished in' in line
+        if line.startswith(('error:', 'error[')):
+            return True if not is_progress else None
+        if line.startswith('note:') and is_progress:
+            return False
+        return None
+
     def parse_verification_failures(self, output_content):
         """Parse verification failures and return detailed information."""
         failures = []
@@ -308,15 +621,13 @@ class VerificationParser:
             line = lines[i].strip()
             
             # Check if this line indicates a verification failure
-            failure_detected = False
+            # One search finds lines mentioning any error type. Only on a hit are
+            # the types checked in list order, so the first listed type wins as before
             error_type = None
-            for error_type_pattern in self.verification_error_types:
-                if error_type_pattern in line:
-                    failure_detected = True
-                    error_type = error_type_pattern
-                    break
+            if self.verification_error_type_pattern.search(line):
+                error_type = next(t for t in self.verification_error_types if t in line)
             
-            if failure_detected and 'error' in line.lower():
+            if error_type and ('error' in line or 'error' in line.lower()):
                 # Capture the complete error text starting from this line
                 error_start_line = i
                 file_path = None
@@ -358,11 +669,11 @@ class VerificationParser:
                                next_next_line.startswith('note:'):
                                 break
                 
-                # Clean ANSI escape codes from all lines
-                clean_full_text = []
-                for line_text in full_error_lines:
-                    clean_line = re.sub(r'\x1b\[[0-9;]*m', '', line_text.rstrip())
-                    clean_full_text.append(clean_line)
+                # Clean ANSI escape codes from all lines with a single substitution over the
+                # whole block (escape sequences never span lines, so this is per-line cleaning)
+                clean_full_text = _ANSI_ESCAPE_RE.sub(
+                    '', '\n'.join(line_text.rstrip() for line_text in full_error_lines)
+                ).split('\n')
                 
                 # Join into complete error text
                 complete_error_text = '\n'.join(clean_full_text).strip()
@@ -373,10 +684,13 @@ class VerificationParser:
                     clean_line = line_text.strip()
                     if clean_line and ('assert' in clean_line or '|' in clean_line or clean_line.startswith('-->')):
                         assertion_details.append(clean_line)
+                        # Only the first 10 details are reported
+                        if len(assertion_details) == 10:
+                            break
                 
                 # Clean other fields
-                clean_file_path = re.sub(r'\x1b\[[0-9;]*m', '', file_path) if file_path else None
-                clean_message = re.sub(r'\x1b\[[0-9;]*m', '', line.strip())
+                clean_file_path = _ANSI_ESCAPE_RE.sub('', file_path) if file_path else None
+                clean_message = _ANSI_ESCAPE_RE.sub('', line.strip())
                 
                 failure = {
                     "error_type": error_type,
@@ -384,7 +698,7 @@ class VerificationParser:
                     "line": line_number,
                     "column": column,
                     "message": clean_message,
-                    "assertion_details": assertion_details[:10],  # Keep backward compatibility
+                    "assertion_details": assertion_details,  # Keep backward compatibility
                     "full_error_text": complete_error_text  # New complete error text
                 }
                 
@@ -396,197 +710,150 @@ class VerificationParser:
 
 
     
-    def find_function_at_line(self, file_path, line_number, all_functions_with_lines):
-        """Find the function that contains or is closest above the given line number."""
-        # Try to find a matching file path (handle relative paths)
-        matching_file = None
-        file_path_normalized = str(Path(file_path))
+    def find_function_at_line(self, file_path, line_number, all_functions_with_lines, function_index=None):
+        """Find the function that contains or is closest above the given line number.
         
-        for file_key in all_functions_with_lines.keys():
-            file_key_normalized = str(Path(file_key))
-            
-            # Exact match
-            if file_path_normalized == file_key_normalized:
-                matching_file = file_key
-                break
-            
-            # Check if one is a suffix of the other (handles relative vs absolute paths)
-            if file_path_normalized.endswith(file_key_normalized) or file_key_normalized.endswith(file_path_normalized):
-                matching_file = file_key
-                break
-            
-            # Check if file_path is contained in file_key or vice versa
-            if file_path_normalized in file_key_normalized or file_key_normalized in file_path_normalized:
-                matching_file = file_key
-                break
-            
-            # Also try just the filename
-            if Path(file_path).name == Path(file_key).name:
-                matching_file = file_key
-                break
+        Pass a FunctionLineIndex built once for all_functions_with_lines when
+        resolving many error locations; otherwise a temporary one is built.
+        """
+        if function_index is None:
+            function_index = FunctionLineIndex(all_functions_with_lines)
+        
+        # Try to find a matching file path (handle relative paths)
+        matching_file = function_index.match_file(file_path)
         
         if matching_file is None:
             return None
         
-        functions_in_file = all_functions_with_lines[matching_file]
-        closest_function = None
-        closest_line = 0
-        
-        for func_name, func_line in functions_in_file:
-            if func_line <= line_number and func_line > closest_line:
-                closest_function = func_name
-                closest_line = func_line
-        
-        return closest_function
+        return function_index.function_at_line(matching_file, line_number)
 
 
 class RustFunctionFinder:
     def __init__(self, include_verus_constructs=False):
         # Pattern to match the start of a verus macro block
-        self.verus_start_pattern = re.compile(r'\bverus!\s*\{')
+        self.verus_start_pattern = _VERUS_START_RE
         
         # Configuration for what to include
         self.include_verus_constructs = include_verus_constructs
         
+        # Function inventories of recently scanned paths, keyed by path and source file stats
+        self._cached_scan = functools.lru_cache(maxsize=8)(self._scan_for_cache)
+        
         if include_verus_constructs:
             # Include all function types including Verus constructs
             # Pattern to match any function definition (including spec, proof, exec, etc.)
-            self.function_pattern = re.compile(r'(?:pub\s+)?(?:(?:spec|proof|exec|open|uninterp|const)\s+)*fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
+            self.function_pattern = re.compile(rb'(?:pub\s+)?(?:(?:spec|proof|exec|open|uninterp|const)\s+)*fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
             
             # Pattern for const functions (including spec const fn)
-            self.const_fn_pattern = re.compile(r'(?:pub\s+)?(?:(?:spec|open|uninterp)\s+)?const\s+fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
+            self.const_fn_pattern = re.compile(rb'(?:pub\s+)?(?:(?:spec|open|uninterp)\s+)?const\s+fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
         else:
             # Original behavior - only regular functions (not spec, proof, exec)
             # This pattern ensures we don't match verus keywords before 'fn'
             # We need to handle cases like "pub proof fn", "pub open spec fn", etc.
-            self.function_pattern = re.compile(r'(?:pub\s+)?(?!(?:spec|proof|exec|open|uninterp)\s+(?:spec\s+)?fn\s)fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
+            self.function_pattern = re.compile(rb'(?:pub\s+)?(?!(?:spec|proof|exec|open|uninterp)\s+(?:spec\s+)?fn\s)fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
             
             # Pattern to match const functions as well (but not spec const fn)
-            self.const_fn_pattern = re.compile(r'(?:pub\s+)?(?!(?:spec|open|uninterp)\s+)const\s+fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
+            self.const_fn_pattern = re.compile(rb'(?:pub\s+)?(?!(?:spec|open|uninterp)\s+)const\s+fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
 
     def find_matching_brace(self, content, start_pos):
         """Find the position of the matching closing brace for a verus! macro."""
-        brace_count = 0
-        i = start_pos
-        
-        while i < len(content):
-            if content[i] == '{':
-                brace_count += 1
-            elif content[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    return i
-            elif content[i] == '"':
-                # Skip string literals
-                i += 1
-                while i < len(content) and content[i] != '"':
-                    if content[i] == '\\':
-                        i += 1  # Skip escaped character
-                    i += 1
-            elif content[i:i+2] == '/*':
-                # Skip block comments
-                i += 2
-                while i < len(content) - 1 and content[i:i+2] != '*/':
-                    i += 1
-                i += 1  # Skip the '*/'
-            elif content[i:i+2] == '//':
-                # Skip line comments
-                while i < len(content) and content[i] != '\n':
-                    i += 1
-            i += 1
-        
-        return -1  # No matching brace found
+        if isinstance(content, str):
+            # The scanner works on UTF-8 bytes; map offsets to and from characters
+            encoded = content.encode('utf-8', 'surrogatepass')
+            end = _find_matching_brace(encoded, len(content[:start_pos].encode('utf-8', 'surrogatepass')))
+            return end if end == -1 else len(encoded[:end].decode('utf-8', 'surrogatepass'))
+        return _find_matching_brace(content, start_pos)
 
     def extract_verus_blocks(self, content):
-        """Extract all verus! macro blocks from the content with their line numbers."""
-        blocks = []
-        start = 0
+        """Extract all verus! macro blocks from the content with their line numbers.
         
-        while True:
-            match = self.verus_start_pattern.search(content, start)
-            if not match:
-                break
-                
-            # Find the opening brace
-            brace_start = match.end() - 1  # The '{' character
-            
-            # Find the matching closing brace
-            brace_end = self.find_matching_brace(content, brace_start)
-            if brace_end == -1:
-                break  # Malformed block
-                
-            # Extract the block content
-            block_content = content[match.start():brace_end + 1]
-            # Calculate line number where the block starts
-            block_start_line = content[:match.start()].count('\n') + 1
-            blocks.append((block_content, block_start_line))
-            
-            start = brace_end + 1
-            
-        return blocks
+        content may be str, bytes or an mmap; blocks come back as str for str
+        input and as bytes otherwise.
+        """
+        if isinstance(content, str):
+            return [(block_content.decode('utf-8', 'surrogatepass'), block_start_line)
+                    for block_content, block_start_line
+                    in self.extract_verus_blocks(content.encode('utf-8', 'surrogatepass'))]
+        return [(content[start:end + 1], start_line)
+                for start, end, start_line in _find_verus_blocks(content, self.verus_start_pattern)]
 
     def extract_functions_from_block(self, block_content, block_start_line=0):
-        """Extract function names and their line numbers from a Verus block."""
+        """Extract function names and their line numbers from a Verus block (str or bytes)."""
         functions = []
         
         # Remove comments to avoid false matches
         content_no_comments = self.remove_comments(block_content)
+        if isinstance(content_no_comments, str):
+            content_no_comments = content_no_comments.encode('utf-8', 'surrogatepass')
+        newline_offsets = _newline_offsets(content_no_comments)
         
+        # Names match [a-zA-Z0-9_], so only that small slice needs decoding
         if self.include_verus_constructs:
             # Include all function types including Verus constructs
             # Find all function patterns using the configured function pattern
             matches = self.function_pattern.finditer(content_no_comments)
             for match in matches:
-                func_name = match.group(1)
-                line_number = block_start_line + content_no_comments[:match.start()].count('\n') + 1
+                func_name = match.group(1).decode('ascii')
+                line_number = block_start_line + bisect.bisect_right(newline_offsets, match.start()) + 1
                 functions.append((func_name, line_number))
             
             # Also check for const functions
             const_matches = self.const_fn_pattern.finditer(content_no_comments)
             for match in const_matches:
-                func_name = match.group(1)
-                line_number = block_start_line + content_no_comments[:match.start()].count('\n') + 1
+                func_name = match.group(1).decode('ascii')
+                line_number = block_start_line + bisect.bisect_right(newline_offsets, match.start()) + 1
                 functions.append((func_name, line_number))
         else:
             # Original behavior - exclude Verus-specific keywords
             # Find all function-like patterns
-            # Pattern to match any function definition with capture groups for keywords and name
-            all_fn_pattern = re.compile(r'(?:pub\s+)?((?:spec|proof|exec|open|uninterp|const)\s+)*fn\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
-            
-            matches = all_fn_pattern.finditer(content_no_comments)
+            matches = _ALL_FN_RE.finditer(content_no_comments)
             for match in matches:
-                keywords = match.group(1) if match.group(1) else ""
-                func_name = match.group(2)
+                # The group holds the last keyword before "fn" plus its trailing
+                # whitespace, so one set lookup decides
+                keywords = match.group(1)
                 
                 # Only include functions that don't have Verus-specific keywords
-                if not any(kw in keywords for kw in ['spec', 'proof', 'exec', 'open', 'uninterp']):
+                if keywords is None or keywords.rstrip() not in _VERUS_FN_KEYWORDS:
+                    func_name = match.group(2).decode('ascii')
                     # Calculate line number within the original file
-                    line_number = block_start_line + content_no_comments[:match.start()].count('\n') + 1
+                    line_number = block_start_line + bisect.bisect_right(newline_offsets, match.start()) + 1
                     functions.append((func_name, line_number))
             
             # Also check for const functions without Verus keywords
             const_matches = self.const_fn_pattern.finditer(content_no_comments)
             for match in const_matches:
-                func_name = match.group(1)
-                line_number = block_start_line + content_no_comments[:match.start()].count('\n') + 1
+                func_name = match.group(1).decode('ascii')
+                line_number = block_start_line + bisect.bisect_right(newline_offsets, match.start()) + 1
                 functions.append((func_name, line_number))
                 
         return functions
 
     def remove_comments(self, content):
         """Remove comments from content to avoid false matches."""
-        # Remove line comments
-        content = re.sub(r'//.*$', '', content, flags=re.MULTILINE)
-        # Remove block comments
-        content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-        return content
+        # Whichever comment starts first wins, so '//' inside a block comment
+        # (e.g. a URL) no longer swallows the comment's closing '*/'
+        if isinstance(content, str):
+            return _COMMENT_RE.sub(b'', content.encode('utf-8', 'surrogatepass')).decode('utf-8', 'surrogatepass')
+        return _COMMENT_RE.sub(b'', content)
 
     def analyze_file(self, file_path):
         """Analyze a single Rust file for function names and their line numbers."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except (UnicodeDecodeError, PermissionError):
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size > _MMAP_MIN_SIZE:
+                    # Let the OS page large files in on demand instead of copying them
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        return self.analyze_content(mapped)
+                raw = f.read()
+        except PermissionError:
+            return []
+        
+        return self.analyze_content(raw)
+
+    def analyze_content(self, content):
+        """Find function names and their line numbers in raw file content (bytes or mmap)."""
+        # Most Rust files have no verus! macro at all; skip them before scanning
+        if content.find(b'verus!') == -1:
             return []
         
         # Extract all verus blocks
@@ -611,7 +878,11 @@ class RustFunctionFinder:
         return rust_files
 
     def find_all_functions(self, path):
-        """Find all function names in the given path (file or directory)."""
+        """Find all function names in the given path (file or directory).
+        
+        Returns a dict keyed by file path as str, mapping to a list of
+        (function_name, line_number) tuples.
+        """
         path = Path(path)
         if not path.exists():
             return {}
@@ -623,40 +894,149 @@ class RustFunctionFinder:
             if functions:
                 all_functions[str(path)] = functions
         else:
-            rust_files = self.find_rust_files(path)
-            for file_path in rust_files:
-                functions = self.analyze_file(file_path)
-                if functions:
-                    all_functions[str(file_path)] = functions
+            all_functions = self._analyze_rust_files(path, self.find_rust_files(path))
         
         return all_functions
 
+    def _analyze_rust_files(self, root_path, rust_files):
+        """Analyze rust_files, the .rs files found under directory root_path.
+        
+        Returns the same mapping as find_all_functions, leaving out files
+        without any functions.
+        """
+        verus_files = _files_containing_verus(root_path)
+        if verus_files is not None:
+            # Only open files ripgrep reported; rg doesn't follow symlinks, so keep those
+            rust_files = [f for f in rust_files if f in verus_files or f.is_symlink()]
+        results = None
+        if len(rust_files) > _PARALLEL_MIN_FILES:
+            results = self._analyze_files_parallel(rust_files)
+        if results is None:
+            results = [(str(file_path), self.analyze_file(file_path)) for file_path in rust_files]
+        
+        all_functions = {}
+        for file_path, functions in results:
+            if functions:
+                all_functions[file_path] = functions
+        return all_functions
+
+    def _analyze_files_parallel(self, rust_files):
+        """Analyze rust_files across worker processes, one finder per worker.
+        
+        File analysis is CPU-bound Python, so this beats a serial loop on
+        large trees. Returns None if no process pool can be used (e.g. in a
+        sandbox without /dev/shm), so the caller falls back to the serial loop.
+        """
+        try:
+            with ProcessPoolExecutor(
+                initializer=_init_analyze_worker, initargs=(self.include_verus_constructs,)
+            ) as executor:
+                return list(executor.map(_analyze_file_worker, rust_files, chunksize=8))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            return None
+
+    def find_all_functions_cached(self, path):
+        """Like find_all_functions, but reuse an earlier result while no .rs file under path has changed."""
+        path = Path(path)
+        if not path.exists():
+            return {}
+        
+        # Any added, removed or modified source file changes the signature
+        rust_files = [path] if path.is_file() else self.find_rust_files(path)
+        signature = []
+        for file_path in rust_files:
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            signature.append((str(file_path), stat.st_mtime_ns, stat.st_size))
+        
+        # Hand out fresh lists so callers can't modify the cached inventory
+        cached = self._cached_scan(str(path), str(path.resolve()), tuple(signature))
+        return {file_path: list(functions) for file_path, functions in cached.items()}
+
+    def _scan_for_cache(self, path_str, resolved_path, signature):
+        """Uncached scan behind find_all_functions_cached; resolved_path only forms part of the cache key.
+        
+        A directory's files are taken from the signature, so a cache miss
+        doesn't walk the tree a second time.
+        """
+        path = Path(path_str)
+        if path.is_file():
+            return self.find_all_functions(path)
+        return self._analyze_rust_files(path, [Path(file_path) for file_path, _, _ in signature])
+
     def categorize_functions_by_verification(self, path, verification_output_file):
         """Categorize functions into verified and failed based on verification output."""
-        # Get all functions with their line numbers
-        all_functions_with_lines = self.find_all_functions(path)
-        
-        # Parse verification output
         parser = VerificationParser()
         errors_by_file = parser.parse_verification_output(verification_output_file)
+        return self._categorize_by_errors(path, parser, errors_by_file)
+
+    def categorize_functions_by_verification_from_string(self, path, verification_output):
+        """Categorize functions as categorize_functions_by_verification does, from in-memory output."""
+        parser = VerificationParser()
+        errors_by_file = parser.parse_verification_output_from_content(verification_output)
+        return self._categorize_by_errors(path, parser, errors_by_file)
+
+    def _categorize_by_errors(self, path, parser, errors_by_file):
+        """Return sorted (verified, failed) function names given the error lines per file."""
+        # Get all functions with their line numbers
+        all_functions_with_lines = self.find_all_functions(path)
         
-        verified_functions = set()
         failed_functions = set()
-        
-        # Collect all function names
-        for file_path, functions in all_functions_with_lines.items():
-            for func_name, line_number in functions:
-                verified_functions.add(func_name)
+        function_index = FunctionLineIndex(all_functions_with_lines)
         
         # Find functions that failed verification
         for file_path, error_lines in errors_by_file.items():
             for error_line in error_lines:
-                failed_func = parser.find_function_at_line(file_path, error_line, all_functions_with_lines)
+                failed_func = parser.find_function_at_line(file_path, error_line, all_functions_with_lines, function_index)
                 if failed_func:
                     failed_functions.add(failed_func)
-                    verified_functions.discard(failed_func)
         
-        return sorted(list(verified_functions)), sorted(list(failed_functions))
+        # Every other function is considered verified
+        all_function_names = _function_names(all_functions_with_lines)
+        verified_functions = all_function_names - failed_functions
+        
+        return sorted(verified_functions), sorted(failed_functions)
+
+
+def _files_containing_verus(root_path):
+    """Return the set of .rs files under root_path that contain 'verus!', using ripgrep.
+    
+    Returns None when rg is not installed or fails, in which case every file
+    has to be checked in Python.
+    """
+    import subprocess
+    
+    try:
+        # --no-ignore/--hidden/--text keep rg from skipping files that rglob would visit
+        proc = subprocess.run(
+            ['rg', '-l', '--no-messages', '--no-ignore', '--hidden', '--text',
+             '--fixed-strings', '--glob', '*.rs', 'verus!', str(root_path)],
+            capture_output=True
+        )
+    except OSError:
+        return None
+    
+    # rg exits with 1 when nothing matched and 2 on errors
+    if proc.returncode not in (0, 1):
+        return None
+    return {Path(line) for line in proc.stdout.decode('utf-8', errors='surrogateescape').splitlines()}
+
+
+# RustFunctionFinder of the current worker process, built by _init_analyze_worker
+_worker_finder = None
+
+
+def _init_analyze_worker(include_verus_constructs):
+    """Build the finder a worker process reuses for every file it analyzes."""
+    global _worker_finder
+    _worker_finder = RustFunctionFinder(include_verus_constructs=include_verus_constructs)
+
+
+def _analyze_file_worker(file_path):
+    """Analyze one file in a worker process (module-level so it can be pickled)."""
+    return str(file_path), _worker_finder.analyze_file(file_path)
 
 
 class VerusRunner:
@@ -759,13 +1139,19 @@ class VerusAnalyzer:
         """Filter functions based on module and/or function name filters."""
         if not module_filter and not function_filter:
             return functions_set
-        
-        filtered_functions = set()
+        return functions_set & self._allowed_functions(all_functions_with_lines, module_filter, function_filter)
+    
+    def _allowed_functions(self, all_functions_with_lines, module_filter=None, function_filter=None):
+        """Return the names of all functions that pass the module and function filters."""
+        allowed_functions = set()
         
         # Convert module filter from Rust path notation to file path
         if module_filter:
             # Convert "backend::serial::u64::field_verus" to "backend/serial/u64/field_verus"
             module_path = module_filter.replace('::', '/')
+            # Build the two path fragments once rather than per file
+            module_file = f"/{module_path}.rs"
+            module_dir = f"/{module_path}/"
             
         for file_path, functions in all_functions_with_lines.items():
             file_path_str = str(file_path)
@@ -774,80 +1160,72 @@ class VerusAnalyzer:
             if module_filter:
                 # Check if the file path contains the module path
                 # We expect files like "src/backend/serial/u64/field_verus.rs" or "src/backend/serial/u64/field_verus/mod.rs"
-                if not (f"/{module_path}.rs" in file_path_str or f"/{module_path}/" in file_path_str):
+                if not (module_file in file_path_str or module_dir in file_path_str):
                     continue
             
-            for func_name, line_number in functions:
-                # Check if function is in our target set
-                if func_name not in functions_set:
-                    continue
-                    
-                # Check if this function matches the function filter
-                if function_filter and func_name != function_filter:
-                    continue
-                
-                filtered_functions.add(func_name)
+            if function_filter:
+                # Only the named function can pass, so skip the per-function loop
+                if any(func_name == function_filter for func_name, _ in functions):
+                    allowed_functions.add(function_filter)
+            else:
+                allowed_functions.update(func_name for func_name, _ in functions)
         
-        return filtered_functions
+        return allowed_functions
         
-    def analyze_output(self, path, output_content, output_file=None, exit_code=None, module_filter=None, function_filter=None):
-        """Comprehensive analysis of Verus verification output."""
-        # Parse compilation errors and warnings
-        compilation_errors, compilation_warnings = self.compilation_parser.parse_compilation_output(output_content)
+    def _categorize_functions(self, path, output_content, verification_failures):
+        """Find all functions under path and split them into verified and failed.
         
+        Returns (all_functions_with_lines, all_function_names, verified_functions, failed_functions).
+        """
         # Get all functions (may fail if path doesn't exist or has issues)
         try:
-            all_functions_with_lines = self.function_finder.find_all_functions(path)
-            all_function_names = set()
-            for file_path, functions in all_functions_with_lines.items():
-                for func_name, line_number in functions:
-                    all_function_names.add(func_name)
+            # Re-analyzing the same unchanged tree reuses the previous scan
+            all_functions_with_lines = self.function_finder.find_all_functions_cached(path)
+            all_function_names = _function_names(all_functions_with_lines)
         except Exception as e:
             # If we can't analyze functions (e.g., path issues), continue with empty set
             all_functions_with_lines = {}
             all_function_names = set()
         
-        # Parse verification results
-        if output_file:
-            errors_by_file = self.verification_parser.parse_verification_output(output_file)
-        else:
-            # Create temporary file with output content
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-                temp_file.write(output_content)
-                temp_file_path = temp_file.name
-            
-            errors_by_file = self.verification_parser.parse_verification_output(temp_file_path)
-            
-            # Clean up temp file
-            import os
-            os.unlink(temp_file_path)
-        
-        # Parse detailed verification failures
-        verification_failures = self.verification_parser.parse_verification_failures(output_content)
+        # Parse verification results from the in-memory output; when it came
+        # from output_file the caller has already read it, so don't re-read
+        errors_by_file = self.verification_parser.parse_verification_output_from_content(output_content)
         
         # Categorize functions
-        verified_functions = set(all_function_names)
         failed_functions = set()
+        function_index = FunctionLineIndex(all_functions_with_lines)
         
         # Find functions that failed verification - use both methods for completeness
         # Method 1: Use errors_by_file from parse_verification_output
         for file_path, error_lines in errors_by_file.items():
             for error_line in error_lines:
-                failed_func = self.verification_parser.find_function_at_line(file_path, error_line, all_functions_with_lines)
+                failed_func = self.verification_parser.find_function_at_line(
+                    file_path, error_line, all_functions_with_lines, function_index
+                )
                 if failed_func:
                     failed_functions.add(failed_func)
-                    verified_functions.discard(failed_func)
         
         # Method 2: Use verification_failures from parse_verification_failures (more reliable)
         for failure in verification_failures:
             if failure.get('file') and failure.get('line'):
                 failed_func = self.verification_parser.find_function_at_line(
-                    failure['file'], failure['line'], all_functions_with_lines
+                    failure['file'], failure['line'], all_functions_with_lines, function_index
                 )
                 if failed_func:
                     failed_functions.add(failed_func)
-                    verified_functions.discard(failed_func)
+        
+        # Every function that did not fail is considered verified
+        verified_functions = all_function_names - failed_functions
+        
+        return all_functions_with_lines, all_function_names, verified_functions, failed_functions
+
+    def analyze_output(self, path, output_content, output_file=None, exit_code=None, module_filter=None, function_filter=None):
+        """Comprehensive analysis of Verus verification output."""
+        # Parse compilation errors and warnings
+        compilation_errors, compilation_warnings = self.compilation_parser.parse_compilation_output(output_content)
+        
+        # Parse detailed verification failures
+        verification_failures = self.verification_parser.parse_verification_failures(output_content)
         
         # Determine overall status
         has_compilation_errors = len(compilation_errors) > 0
@@ -877,25 +1255,29 @@ class VerusAnalyzer:
                 status = "success"
         elif has_compilation_errors:
             status = "compilation_failed"
-            # If compilation failed and no verification results, we can't verify any functions
+        else:
+            status = "success"
+        
+        if status == "compilation_failed":
+            # If compilation failed and no verification results, we can't verify any functions,
+            # so don't spend time walking the source tree for them
+            all_functions_with_lines = {}
+            all_function_names = set()
             verified_functions = set()
             failed_functions = set()
         else:
-            status = "success"
+            all_functions_with_lines, all_function_names, verified_functions, failed_functions = \
+                self._categorize_functions(path, output_content, verification_failures)
         
         # Apply module and function filtering if specified
         if module_filter or function_filter:
-            verified_functions = self.filter_functions_by_module_and_function(
-                all_functions_with_lines, verified_functions, module_filter, function_filter
-            )
-            failed_functions = self.filter_functions_by_module_and_function(
-                all_functions_with_lines, failed_functions, module_filter, function_filter
-            )
+            # Compute the allowed names once and intersect every set with them
+            allowed_functions = self._allowed_functions(all_functions_with_lines, module_filter, function_filter)
+            verified_functions &= allowed_functions
+            failed_functions &= allowed_functions
             
             # Also filter all_function_names for consistency
-            all_function_names = self.filter_functions_by_module_and_function(
-                all_functions_with_lines, all_function_names, module_filter, function_filter
-            )
+            all_function_names &= allowed_functions
         
         return {
             "status": status,
@@ -912,19 +1294,17 @@ class VerusAnalyzer:
                 "warnings": compilation_warnings
             },
             "verification": {
-                "verified_functions": sorted(list(verified_functions)),
-                "failed_functions": sorted(list(failed_functions)),
+                "verified_functions": sorted(verified_functions),
+                "failed_functions": sorted(failed_functions),
                 "errors": verification_failures
             },
-            "functions_by_file": {
-                str(file_path): [{"name": func_name, "line": line_num} for func_name, line_num in functions]
-                for file_path, functions in all_functions_with_lines.items()
-            }
+            "functions_by_file": _functions_by_file(all_functions_with_lines)
         }
 
 
-def main():
-    import sys
+@functools.lru_cache(maxsize=None)
+def _build_parser():
+    """Build the command-line parser once; repeated main() calls reuse it."""
     import argparse
     
     parser = argparse.ArgumentParser(
@@ -963,8 +1343,13 @@ Examples:
                        help='Output format (default: text)')
     parser.add_argument('--exclude-verus-constructs', action='store_true',
                        help='Exclude Verus constructs (spec, proof, exec) and only include regular functions')
+    return parser
+
+
+def main():
+    import sys
     
-    args = parser.parse_args()
+    args = _build_parser().parse_args()
     
     # Handle --run-verification flag
     verification_output = None
@@ -988,8 +1373,10 @@ Examples:
         print("=" * 60 + "\n")
         
         # Check if verification succeeded
-        if 'verification results::' in verification_output:
-            if ', 0 errors' in verification_output:
+        # One scan collects the error count of every results line
+        error_counts = _VERIF_SUMMARY_RE.findall(verification_output)
+        if error_counts:
+            if '0' in error_counts:
                 print("✓ Verification succeeded!")
             else:
                 print("✗ Verification failed with errors")
@@ -1015,22 +1402,18 @@ Examples:
         elif args.output_file:
             # Read output file and analyze
             try:
-                with open(args.output_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = _read_output_file(args.output_file)
                 result = analyzer.analyze_output(args.path, content, args.output_file, exit_code=args.exit_code,
                                                 module_filter=args.verify_only_module, function_filter=args.verify_function)
-            except (FileNotFoundError, UnicodeDecodeError, PermissionError) as e:
+            except (FileNotFoundError, PermissionError) as e:
                 print(f"Error reading output file: {e}", file=sys.stderr)
                 return 1
         else:
             # No output to analyze, just get function list
             finder = RustFunctionFinder(include_verus_constructs=not args.exclude_verus_constructs)
             all_functions_with_lines = finder.find_all_functions(args.path)
-            all_function_names = set()
-            
-            for file_path, functions in all_functions_with_lines.items():
-                for func_name, line_number in functions:
-                    all_function_names.add(func_name)
+            # Names and the per-file listing come from one walk of the inventory
+            all_function_names, functions_by_file = _function_inventory(all_functions_with_lines)
             
             # Apply filtering if specified
             if args.verify_only_module or args.verify_function:
@@ -1039,38 +1422,17 @@ Examples:
                     all_functions_with_lines, all_function_names, args.verify_only_module, args.verify_function
                 )
             
-            result = {
-                "status": "functions_only",
-                "summary": {
-                    "total_functions": len(all_function_names),
-                    "verified_functions": 0,
-                    "failed_functions": 0,
-                    "compilation_errors": 0,
-                    "compilation_warnings": 0,
-                    "verification_errors": 0
-                },
-                "compilation": {
-                    "errors": [],
-                    "warnings": []
-                },
-                "verification": {
-                    "verified_functions": [],
-                    "failed_functions": [],
-                    "errors": []
-                },
-                "all_functions": sorted(list(all_function_names)),
-                "functions_by_file": {
-                    str(file_path): [{"name": func_name, "line": line_num} for func_name, line_num in functions]
-                    for file_path, functions in all_functions_with_lines.items()
-                }
-            }
+            result = _functions_only_result(sorted(all_function_names), functions_by_file)
         
         if args.json_output:
-            with open(args.json_output, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2)
+            with open(args.json_output, 'wb') as f:
+                f.write(_json_bytes(result))
             print(f"JSON output written to {args.json_output}")
         else:
-            print(json.dumps(result, indent=2))
+            # Write the encoded bytes straight to stdout, after anything already printed
+            sys.stdout.flush()
+            sys.stdout.buffer.write(_json_bytes(result) + b'\n')
+            sys.stdout.flush()
     
     else:
         # Original text output behavior
@@ -1078,27 +1440,19 @@ Examples:
         
         if verification_output is not None:
             # Use output from --run-verification for text mode
-            # Create temporary file with verification output
-            import tempfile
-            import os
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-                temp_file.write(verification_output)
-                temp_file_path = temp_file.name
+            verified_functions, failed_functions = finder.categorize_functions_by_verification_from_string(
+                args.path, verification_output
+            )
             
-            try:
-                verified_functions, failed_functions = finder.categorize_functions_by_verification(args.path, temp_file_path)
-                
-                print("=== VERIFIED FUNCTIONS ===")
-                for func_name in verified_functions:
-                    print(func_name)
+            print("=== VERIFIED FUNCTIONS ===")
+            for func_name in verified_functions:
+                print(func_name)
+            
+            print("\n=== FAILED VERIFICATION ===")
+            for func_name in failed_functions:
+                print(func_name)
                 
-                print("\n=== FAILED VERIFICATION ===")
-                for func_name in failed_functions:
-                    print(func_name)
-                    
-                print(f"\nSummary: {len(verified_functions)} verified, {len(failed_functions)} failed")
-            finally:
-                os.unlink(temp_file_path)
+            print(f"\nSummary: {len(verified_functions)} verified, {len(failed_functions)} failed")
         elif args.output_file:
             # Categorize functions based on verification results
             verified_functions, failed_functions = finder.categorize_functions_by_verification(args.path, args.output_file)
@@ -1115,11 +1469,7 @@ Examples:
         else:
             # Original behavior - just list all functions
             all_functions_with_lines = finder.find_all_functions(args.path)
-            all_function_names = set()
-            
-            for file_path, functions in all_functions_with_lines.items():
-                for func_name, line_number in functions:
-                    all_function_names.add(func_name)
+            all_function_names = _function_names(all_functions_with_lines)
             
             # Print all function names, one per line
             for func_name in sorted(all_function_names):
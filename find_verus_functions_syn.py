@@ -8,87 +8,173 @@ but using proper AST parsing via verus_syn for more accurate results.
 """
 
 import re
+import bisect
+import functools
 import json
 import sys
 import argparse
+from array import array
+from collections import deque
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Tuple, Set, Optional
 
+try:
+    # Optional: much faster serialization of large JSON results
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import the verus_syn wrapper
 from verus_parser_wrapper import VerusParser
 
+# ANSI color/style escape sequences, stripped from compiler output
+_ANSI_ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*m')
+# Error count of each "verification results::" summary line ('' if it has none)
+_VERIF_SUMMARY_RE = re.compile(r'verification results::(?:[^\n]*?, (\d+) errors?)?')
+# Line prefixes that continue the current compilation error or warning
+_ERROR_CONTINUATION_PREFIXES = ('|', '^', '=', 'Caused by:', '(signal:', "  process didn't exit successfully:")
+_WARNING_CONTINUATION_PREFIXES = ('|', '^', '=')
+
+
+def _functions_only_result(all_functions: List[str], functions_by_file: Dict[str, List[Dict]]) -> Dict:
+    """Build the JSON result for a run that only lists functions.
+    
+    The nested containers are created fresh on every call, so no two results
+    share mutable state.
+    """
+    return {
+        "status": "functions_only",
+        "summary": {
+            "total_functions": len(all_functions),
+            "verified_functions": 0,
+            "failed_functions": 0,
+            "compilation_errors": 0,
+            "compilation_warnings": 0,
+            "verification_errors": 0
+        },
+        "compilation": {
+            "errors": [],
+            "warnings": []
+        },
+        "verification": {
+            "verified_functions": [],
+            "failed_functions": [],
+            "errors": []
+        },
+        "all_functions": all_functions,
+        "functions_by_file": functions_by_file
+    }
+
 
 class CompilationErrorParser:
     """Parse compilation errors from cargo/verus output (unchanged from original)."""
     
-    def __init__(self):
-        # Pattern to match compilation errors - improved for Cargo output
-        self.error_pattern = re.compile(r'error(?:\[E\d+\])?: (.+)')
-        self.cargo_error_pattern = re.compile(r'error: could not compile `([^`]+)`')
-        self.warning_pattern = re.compile(r'warning: (.+)')
-        self.file_location_pattern = re.compile(r'-->\s+([^:]+):(\d+):(\d+)')
-        self.process_error_pattern = re.compile(r"process didn't exit successfully: (.+)")
-        self.memory_error_pattern = re.compile(r'memory allocation of \d+ bytes failed')
-        self.caused_by_pattern = re.compile(r'Caused by:')
-        self.exit_status_pattern = re.compile(r'\(exit status: (\d+)\)')
-        self.verus_command_exit_pattern = re.compile(r'Verus command completed with exit code: (\d+)')
-        self.verification_results_pattern = re.compile(r'verification results::\s*(\d+)\s+verified,\s*(\d+)\s+errors?')
-        self.verification_error_patterns = [
-            re.compile(r'error: assertion failed'),
-            re.compile(r'error: postcondition not satisfied'),
-            re.compile(r'error: precondition not satisfied'),
-            re.compile(r'error: loop invariant not preserved'),
-            re.compile(r'error: loop invariant not satisfied on entry'),
-            re.compile(r'error: assertion not satisfied'),
-        ]
+    # Patterns are compiled once at class level and shared by all instances.
+    # Pattern to match compilation errors - improved for Cargo output
+    error_pattern = re.compile(r'error(?:\[E\d+\])?: (.+)')
+    cargo_error_pattern = re.compile(r'error: could not compile `([^`]+)`')
+    warning_pattern = re.compile(r'warning: (.+)')
+    file_location_pattern = re.compile(r'-->\s+([^:]+):(\d+):(\d+)')
+    process_error_pattern = re.compile(r"process didn't exit successfully: (.+)")
+    memory_error_pattern = re.compile(r'memory allocation of \d+ bytes failed')
+    caused_by_pattern = re.compile(r'Caused by:')
+    exit_status_pattern = re.compile(r'\(exit status: (\d+)\)')
+    verus_command_exit_pattern = re.compile(r'Verus command completed with exit code: (\d+)')
+    verification_results_pattern = re.compile(r'verification results::\s*(\d+)\s+verified,\s*(\d+)\s+errors?')
+    verification_error_patterns = [
+        re.compile(r'error: assertion failed'),
+        re.compile(r'error: postcondition not satisfied'),
+        re.compile(r'error: precondition not satisfied'),
+        re.compile(r'error: loop invariant not preserved'),
+        re.compile(r'error: loop invariant not satisfied on entry'),
+        re.compile(r'error: assertion not satisfied'),
+    ]
+    # The patterns above as one alternation, so a line needs one search
+    verification_error_pattern = re.compile('|'.join(p.pattern for p in verification_error_patterns))
+    # All line kinds above combined into one pattern. Each alternative is
+    # anchored with a lazy ".*?" so that alternatives are tried in priority
+    # order (as the separate searches used to be) rather than by position;
+    # match.lastgroup names the kind that matched.
+    line_pattern = re.compile(
+        r'.*?(?P<results>verification results::\s*\d+\s+verified,\s*\d+\s+errors?)'
+        r'|.*?(?P<cargo>error: could not compile `(?P<crate>[^`]+)`)'
+        r'|.*?(?P<memory>memory allocation of \d+ bytes failed)'
+        r'|.*?(?P<verus_exit>Verus command completed with exit code: (?P<exit_code>\d+))'
+        r"|.*?(?P<process>process didn't exit successfully: (?P<process_detail>.+))"
+        r'|.*?(?P<error>error(?:\[E\d+\])?: (?P<error_message>.+))'
+        r'|.*?(?P<warning>warning: (?P<warning_message>.+))'
+        r'|.*?(?P<location>-->\s+(?P<location_file>[^:]+):(?P<location_line>\d+):(?P<location_column>\d+))'
+    )
     
-    def parse_compilation_output(self, output_content):
-        """Parse compilation output and extract errors and warnings."""
+    @staticmethod
+    def _may_classify(line):
+        """Cheap literal pre-check: can line_pattern match this line at all?"""
+        return ('error' in line or 'warning: ' in line or '-->' in line or
+                'memory allocation' in line or "process didn't" in line or 'Verus command' in line)
+    
+    def parse_compilation_output(self, output_content, lines=None):
+        """Parse compilation output and extract errors and warnings.
+        
+        lines may be passed as output_content.split('\n') when the caller
+        already has it, so the output is only split once.
+        """
         errors = []
         warnings = []
         current_error = None
         current_warning = None
-        has_verification_results = False
         
-        lines = output_content.split('\n')
+        if lines is None:
+            lines = output_content.split('\n')
         
         # First pass: check if we have verification results
-        for line in lines:
-            line = line.strip()
-            if self.verification_results_pattern.search(line):
-                has_verification_results = True
-                break
+        search_results = self.verification_results_pattern.search
+        has_verification_results = any(search_results(line) for line in lines)
         
         for i, line in enumerate(lines):
             line = line.strip()
             
+            if not line:
+                if current_error and len(current_error["full_message"]) > 0:
+                    errors.append(current_error)
+                    current_error = None
+                if current_warning and len(current_warning["full_message"]) > 0:
+                    warnings.append(current_warning)
+                    current_warning = None
+                continue
+            
+            # One ordered match classifies the line; lines without any of the
+            # literals the patterns need (most context/progress lines) skip it
+            match = self.line_pattern.match(line) if self._may_classify(line) else None
+            kind = match.lastgroup if match else None
+            
             # Check for verification results summary
-            verification_results_match = self.verification_results_pattern.search(line)
-            if verification_results_match:
+            if kind == 'results':
                 continue
             
             # Check for cargo compilation errors
-            cargo_error_match = self.cargo_error_pattern.search(line)
-            if cargo_error_match:
+            if kind == 'cargo':
                 if has_verification_results:
                     continue
                     
                 if current_error:
                     errors.append(current_error)
                 current_error = {
-                    "message": f"Compilation failed for crate: {cargo_error_match.group(1)}",
+                    "message": None,
                     "file": None,
                     "line": None,
                     "column": None,
-                    "full_message": [line]
+                    "full_message": [line],
+                    "message_parts": [f"Compilation failed for crate: {match.group('crate')}"]
                 }
                 continue
             
             # Check for memory allocation errors
-            if self.memory_error_pattern.search(line):
+            if kind == 'memory':
                 if current_error:
                     current_error["full_message"].append(line)
-                    current_error["message"] += f" - {line}"
+                    current_error["message_parts"].append(f" - {line}")
                 else:
                     errors.append({
                         "message": line,
@@ -100,42 +186,41 @@ class CompilationErrorParser:
                 continue
             
             # Check for Verus command exit code messages
-            verus_exit_match = self.verus_command_exit_pattern.search(line)
-            if verus_exit_match:
-                exit_code = int(verus_exit_match.group(1))
+            if kind == 'verus_exit':
+                exit_code = int(match.group('exit_code'))
                 if current_error:
                     current_error["full_message"].append(line)
-                    current_error["message"] += f" (exit code: {exit_code})"
+                    current_error["message_parts"].append(f" (exit code: {exit_code})")
                 else:
                     current_error = {
-                        "message": f"Verus command failed with exit code {exit_code}",
+                        "message": None,
                         "file": None,
                         "line": None,
                         "column": None,
-                        "full_message": [line]
+                        "full_message": [line],
+                        "message_parts": [f"Verus command failed with exit code {exit_code}"]
                     }
                 continue
             
             # Check for process failure errors
-            process_error_match = self.process_error_pattern.search(line)
-            if process_error_match:
+            if kind == 'process':
                 if current_error:
                     current_error["full_message"].append(line)
-                    current_error["message"] += f" - {process_error_match.group(1)}"
+                    current_error["message_parts"].append(f" - {match.group('process_detail')}")
                 else:
                     current_error = {
-                        "message": f"Process execution failed: {process_error_match.group(1)}",
+                        "message": None,
                         "file": None,
                         "line": None,
                         "column": None,
-                        "full_message": [line]
+                        "full_message": [line],
+                        "message_parts": [f"Process execution failed: {match.group('process_detail')}"]
                     }
                 continue
             
             # Check for standard error format
-            error_match = self.error_pattern.search(line)
-            if error_match:
-                is_verification_error = any(pattern.search(line) for pattern in self.verification_error_patterns)
+            if kind == 'error':
+                is_verification_error = self.verification_error_pattern.search(line) is not None
                 
                 if is_verification_error:
                     continue
@@ -143,21 +228,21 @@ class CompilationErrorParser:
                 if current_error:
                     errors.append(current_error)
                 current_error = {
-                    "message": error_match.group(1).strip(),
+                    "message": None,
                     "file": None,
                     "line": None,
                     "column": None,
-                    "full_message": [line]
+                    "full_message": [line],
+                    "message_parts": [match.group('error_message').strip()]
                 }
                 continue
             
             # Check for warning
-            warning_match = self.warning_pattern.search(line)
-            if warning_match:
+            if kind == 'warning':
                 if current_warning:
                     warnings.append(current_warning)
                 current_warning = {
-                    "message": warning_match.group(1).strip(),
+                    "message": match.group('warning_message').strip(),
                     "file": None,
                     "line": None,
                     "column": None,
@@ -166,11 +251,10 @@ class CompilationErrorParser:
                 continue
             
             # Check for file location
-            location_match = self.file_location_pattern.search(line)
-            if location_match:
-                file_path = location_match.group(1)
-                line_num = int(location_match.group(2))
-                column = int(location_match.group(3))
+            if kind == 'location':
+                file_path = match.group('location_file')
+                line_num = int(match.group('location_line'))
+                column = int(match.group('location_column'))
                 
                 if current_error:
                     current_error["file"] = file_path
@@ -185,33 +269,32 @@ class CompilationErrorParser:
                 continue
             
             # Add continuation lines
-            if current_error and (line.startswith('|') or line.startswith('^') or line.startswith('=') or 
-                                line.startswith('Caused by:') or line.startswith('(signal:') or 
-                                line.startswith('  process didn\'t exit successfully:') or 
-                                self.exit_status_pattern.search(line)):
+            # The literal check keeps the exit-status regex off ordinary context lines
+            if current_error and (line.startswith(_ERROR_CONTINUATION_PREFIXES) or
+                                  ('(exit status: ' in line and self.exit_status_pattern.search(line))):
                 current_error["full_message"].append(line)
                 if line.startswith('Caused by:'):
-                    current_error["message"] += f" - {line.strip()}"
+                    current_error["message_parts"].append(f" - {line.strip()}")
                 elif '(signal:' in line:
-                    current_error["message"] += f" - {line.strip()}"
-                elif self.exit_status_pattern.search(line):
+                    current_error["message_parts"].append(f" - {line.strip()}")
+                else:
                     exit_match = self.exit_status_pattern.search(line)
                     if exit_match:
-                        current_error["message"] += f" (exit status: {exit_match.group(1)})"
-            elif current_warning and (line.startswith('|') or line.startswith('^') or line.startswith('=')):
+                        current_error["message_parts"].append(f" (exit status: {exit_match.group(1)})")
+            elif current_warning and line.startswith(_WARNING_CONTINUATION_PREFIXES):
                 current_warning["full_message"].append(line)
-            elif line == "":
-                if current_error and len(current_error["full_message"]) > 0:
-                    errors.append(current_error)
-                    current_error = None
-                if current_warning and len(current_warning["full_message"]) > 0:
-                    warnings.append(current_warning)
-                    current_warning = None
         
         if current_error:
             errors.append(current_error)
         if current_warning:
             warnings.append(current_warning)
+        
+        # Build error messages from their accumulated fragments in one join
+        # rather than by repeated string concatenation while parsing
+        for error in errors:
+            message_parts = error.pop("message_parts", None)
+            if message_parts is not None:
+                error["message"] = "".join(message_parts)
             
         return errors, warnings
     
@@ -220,85 +303,163 @@ class CompilationErrorParser:
         return self.verification_results_pattern.search(output_content) is not None
 
 
+class FunctionLineIndex:
+    """Precomputed lookups used by VerificationParser.find_function_at_line."""
+    
+    def __init__(self, all_functions_with_lines: Dict[str, List[Tuple[str, int]]]):
+        self.all_functions_with_lines = all_functions_with_lines
+        # Normalized path and basename of every file key, computed once, and the
+        # file key resolved for each error path, memoized across lookups
+        self._file_keys = [
+            (file_key, str(Path(file_key)), Path(file_key).name)
+            for file_key in all_functions_with_lines
+        ]
+        # Normalized path -> first file key with that path, for O(1) exact matches
+        self._file_keys_by_path: Dict[str, str] = {}
+        for file_key, file_key_normalized, _ in self._file_keys:
+            self._file_keys_by_path.setdefault(file_key_normalized, file_key)
+        self._file_match_cache: Dict[str, Optional[str]] = {}
+        # Per-file (lines, names) arrays sorted by line, built on first lookup
+        self._line_tables: Dict[str, Tuple['array[int]', List[str]]] = {}
+    
+    def match_file(self, file_path: str) -> Optional[str]:
+        """Return the file key matching file_path, or None if no file matches."""
+        if file_path in self._file_match_cache:
+            return self._file_match_cache[file_path]
+        
+        file_path_normalized = str(Path(file_path))
+        
+        # A key naming exactly this file is the best possible match
+        matching_file = self._file_keys_by_path.get(file_path_normalized)
+        
+        if matching_file is None:
+            # Otherwise keys are tried in order and the first one that matches wins.
+            # Suffix matches (relative vs absolute paths) are special cases of the
+            # containment check; as a last resort match on the filename alone.
+            file_name = Path(file_path).name
+            for file_key, file_key_normalized, file_key_name in self._file_keys:
+                if (file_path_normalized in file_key_normalized or file_key_normalized in file_path_normalized
+                        or file_name == file_key_name):
+                    matching_file = file_key
+                    break
+        
+        self._file_match_cache[file_path] = matching_file
+        return matching_file
+    
+    def function_at_line(self, file_key: str, line_number: int) -> Optional[str]:
+        """Return the function in file_key closest above (or at) line_number, or None."""
+        line_table = self._line_tables.get(file_key)
+        if line_table is None:
+            line_table = self._line_tables[file_key] = self._build_line_table(file_key)
+        lines, names = line_table
+        
+        idx = bisect.bisect_right(lines, line_number) - 1
+        if idx >= 0 and lines[idx] > 0:
+            return names[idx]
+        return None
+    
+    def _build_line_table(self, file_key: str) -> Tuple['array[int]', List[str]]:
+        """Sort a file's functions by line into parallel line/name arrays for bisect.
+        
+        Lines are kept in a compact array of C ints, which bisect searches directly.
+        """
+        lines = array('i')
+        names = []
+        # sorted() is stable, so when several functions share a line the first
+        # one listed is kept, matching the original linear scan
+        for func_name, func_line in sorted(self.all_functions_with_lines[file_key], key=lambda func: func[1]):
+            if lines and lines[-1] == func_line:
+                continue
+            lines.append(func_line)
+            names.append(func_name)
+        return lines, names
+
+
 class VerificationParser:
     """Parse verification results (unchanged from original)."""
     
-    def __init__(self):
-        self.error_pattern = re.compile(r'-->\s+([^:]+):(\d+):\d+')
-        self.verification_failure_pattern = re.compile(r'error.*assertion failed')
-        self.verification_error_types = [
-            'assertion failed',
-            'postcondition not satisfied', 
-            'precondition not satisfied',
-            'loop invariant not preserved',
-            'loop invariant not satisfied on entry',
-            'assertion not satisfied'
-        ]
+    # Patterns are compiled once at class level and shared by all instances.
+    error_pattern = re.compile(r'-->\s+([^:]+):(\d+):\d+')
+    verification_failure_pattern = re.compile(r'error.*assertion failed')
+    verification_error_types = [
+        'assertion failed',
+        'postcondition not satisfied', 
+        'precondition not satisfied',
+        'loop invariant not preserved',
+        'loop invariant not satisfied on entry',
+        'assertion not satisfied'
+    ]
+    # Matches a line containing any of the error types above
+    verification_error_type_pattern = re.compile('|'.join(map(re.escape, verification_error_types)))
     
     def parse_verification_output(self, output_file_path):
         """Parse verification output and extract files with errors and their line numbers."""
         try:
-            with open(output_file_path, 'r', encoding='utf-8') as f:
+            with open(output_file_path, 'r', encoding='utf-8', errors='replace') as f:
                 content = f.read()
-        except (FileNotFoundError, UnicodeDecodeError, PermissionError):
+        except (FileNotFoundError, PermissionError):
             return {}
         
         return self.parse_verification_output_from_content(content)
 
-    def parse_verification_output_from_content(self, output_content):
+    def parse_verification_output_from_content(self, output_content, lines=None):
         """Parse verification output content and extract files with errors and their line numbers."""
         errors_by_file = {}
-        lines = output_content.split('\n')
+        if lines is None:
+            lines = output_content.split('\n')
+        # (line index, is_error) of the context events among the previous lines.
+        # A 10-line window holds at most 10 events, so older ones fall off.
+        recent_events = deque(maxlen=10)
         
         for i, line in enumerate(lines):
             match = self.error_pattern.search(line)
             if match:
-                file_path = match.group(1)
-                line_number = int(match.group(2))
-                
-                is_actual_error = False
-                
-                for j in range(max(0, i - 10), i):
-                    prev_line = lines[j].strip()
-                    
-                    if prev_line.startswith('error:') or prev_line.startswith('error['):
-                        if not (prev_line.startswith('note:') or 'has been running for' in prev_line or 
-                               'finished in' in prev_line or 'check has been running' in prev_line or
-                               'check finished in' in prev_line):
-                            is_actual_error = True
-                            break
-                    
-                    if (prev_line.startswith('note:') and 
-                        ('has been running for' in prev_line or 'finished in' in prev_line or
-                         'check has been running' in prev_line or 'check finished in' in prev_line)):
-                        is_actual_error = False
-                        break
-                
-                if is_actual_error:
-                    if file_path not in errors_by_file:
-                        errors_by_file[file_path] = []
-                    errors_by_file[file_path].append(line_number)
+                # Forget context events from more than 10 lines back
+                while recent_events and recent_events[0][0] < i - 10:
+                    recent_events.popleft()
+                # The earliest event in the window decides: an error message marks
+                # an actual error location, an informational note a non-error one
+                if recent_events and recent_events[0][1]:
+                    errors_by_file.setdefault(match.group(1), []).append(int(match.group(2)))
+            
+            event = self._context_event(line.strip())
+            if event is not None:
+                recent_events.append((i, event))
         
         return errors_by_file
 
-    def parse_verification_failures(self, output_content):
+    @staticmethod
+    def _context_event(line):
+        """Classify a stripped line as context for later location lines.
+        
+        Returns True for an error message, False for an informational note
+        (e.g. "note: check has been running for ..."), and None otherwise.
+        """
+        # "check has been running" and "check finished in" are covered by these two
+        is_progress = 'has been running for' in line or 'finished in' in line
+        if line.startswith(('error:', 'error[')):
+            return True if not is_progress else None
+        if line.startswith('note:') and is_progress:
+            return False
+        return None
+
+    def parse_verification_failures(self, output_content, lines=None):
         """Parse verification failures and return detailed information."""
         failures = []
-        lines = output_content.split('\n')
+        if lines is None:
+            lines = output_content.split('\n')
         
         i = 0
         while i < len(lines):
             line = lines[i].strip()
             
-            failure_detected = False
+            # One search finds lines mentioning any error type. Only on a hit are
+            # the types checked in list order, so the first listed type wins as before
             error_type = None
-            for error_type_pattern in self.verification_error_types:
-                if error_type_pattern in line:
-                    failure_detected = True
-                    error_type = error_type_pattern
-                    break
+            if self.verification_error_type_pattern.search(line):
+                error_type = next(t for t in self.verification_error_types if t in line)
             
-            if failure_detected and 'error' in line.lower():
+            if error_type and ('error' in line or 'error' in line.lower()):
                 error_start_line = i
                 file_path = None
                 line_number = None
@@ -332,10 +493,11 @@ class VerificationParser:
                                next_next_line.startswith('note:'):
                                 break
                 
-                clean_full_text = []
-                for line_text in full_error_lines:
-                    clean_line = re.sub(r'\x1b\[[0-9;]*m', '', line_text.rstrip())
-                    clean_full_text.append(clean_line)
+                # Clean ANSI escape codes from all lines with a single substitution over the
+                # whole block (escape sequences never span lines, so this is per-line cleaning)
+                clean_full_text = _ANSI_ESCAPE_RE.sub(
+                    '', '\n'.join(line_text.rstrip() for line_text in full_error_lines)
+                ).split('\n')
                 
                 complete_error_text = '\n'.join(clean_full_text).strip()
                 
@@ -344,9 +506,12 @@ class VerificationParser:
                     clean_line = line_text.strip()
                     if clean_line and ('assert' in clean_line or '|' in clean_line or clean_line.startswith('-->')):
                         assertion_details.append(clean_line)
+                        # Only the first 10 details are reported
+                        if len(assertion_details) == 10:
+                            break
                 
-                clean_file_path = re.sub(r'\x1b\[[0-9;]*m', '', file_path) if file_path else None
-                clean_message = re.sub(r'\x1b\[[0-9;]*m', '', line.strip())
+                clean_file_path = _ANSI_ESCAPE_RE.sub('', file_path) if file_path else None
+                clean_message = _ANSI_ESCAPE_RE.sub('', line.strip())
                 
                 failure = {
                     "error_type": error_type,
@@ -354,7 +519,7 @@ class VerificationParser:
                     "line": line_number,
                     "column": column,
                     "message": clean_message,
-                    "assertion_details": assertion_details[:10],
+                    "assertion_details": assertion_details,
                     "full_error_text": complete_error_text
                 }
                 
@@ -364,43 +529,72 @@ class VerificationParser:
         
         return failures
     
-    def find_function_at_line(self, file_path, line_number, all_functions_with_lines):
-        """Find the function that contains or is closest above the given line number."""
-        matching_file = None
-        file_path_normalized = str(Path(file_path))
+    def find_function_at_line(self, file_path, line_number, all_functions_with_lines, function_index=None):
+        """Find the function that contains or is closest above the given line number.
         
-        for file_key in all_functions_with_lines.keys():
-            file_key_normalized = str(Path(file_key))
-            
-            if file_path_normalized == file_key_normalized:
-                matching_file = file_key
-                break
-            
-            if file_path_normalized.endswith(file_key_normalized) or file_key_normalized.endswith(file_path_normalized):
-                matching_file = file_key
-                break
-            
-            if file_path_normalized in file_key_normalized or file_key_normalized in file_path_normalized:
-                matching_file = file_key
-                break
-            
-            if Path(file_path).name == Path(file_key).name:
-                matching_file = file_key
-                break
+        Pass a FunctionLineIndex built once for all_functions_with_lines when
+        resolving many error locations; otherwise a temporary one is built.
+        """
+        if function_index is None:
+            function_index = FunctionLineIndex(all_functions_with_lines)
+        
+        matching_file = function_index.match_file(file_path)
         
         if matching_file is None:
             return None
         
-        functions_in_file = all_functions_with_lines[matching_file]
-        closest_function = None
-        closest_line = 0
-        
-        for func_name, func_line in functions_in_file:
-            if func_line <= line_number and func_line > closest_line:
-                closest_function = func_name
-                closest_line = func_line
-        
-        return closest_function
+        return function_index.function_at_line(matching_file, line_number)
+
+
+def _json_bytes(obj) -> bytes:
+    """Serialize obj as 2-space indented JSON, encoded as UTF-8 bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # e.g. surrogate-escaped non-UTF-8 paths, which json.dumps escapes
+            pass
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+def _read_output_file(path: str) -> str:
+    """Read a verification log as text in one binary read and one decode pass.
+    
+    Newlines are normalized as text-mode reading would; undecodable bytes
+    are replaced rather than rejecting the whole log.
+    """
+    content = Path(path).read_bytes().decode('utf-8', errors='replace')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _function_names(all_functions_with_lines: Dict[str, List[Tuple[str, int]]]) -> Set[str]:
+    """Return the set of distinct function names in a file -> [(name, line), ...] mapping."""
+    return set(map(itemgetter(0), chain.from_iterable(all_functions_with_lines.values())))
+
+
+def _function_inventory(all_functions_with_lines: Dict[str, List[Tuple[str, int]]]) -> Tuple[Set[str], Dict[str, List[Dict]]]:
+    """Return (function names, JSON "functions_by_file" mapping) built in a single pass.
+    
+    File paths come from verus-parser's JSON, so they are already str keys.
+    """
+    function_names = set()
+    functions_by_file = {}
+    for file_path, functions in all_functions_with_lines.items():
+        functions_by_file[file_path] = [{"name": func_name, "line": line_num} for func_name, line_num in functions]
+        function_names.update(map(itemgetter(0), functions))
+    return function_names, functions_by_file
+
+
+@functools.lru_cache(maxsize=None)
+def _get_verus_parser() -> VerusParser:
+    """Return the shared VerusParser, locating the binary on first use.
+    
+    The wrapper holds no per-config state, so one instance serves every
+    RustFunctionFinder. A missing binary raises and is not cached.
+    """
+    return VerusParser()
 
 
 class RustFunctionFinder:
@@ -409,7 +603,7 @@ class RustFunctionFinder:
     def __init__(self, include_verus_constructs=False):
         self.include_verus_constructs = include_verus_constructs
         try:
-            self.parser = VerusParser()
+            self.parser = _get_verus_parser()
         except FileNotFoundError as e:
             print(f"Warning: {e}", file=sys.stderr)
             print("Falling back to basic mode (no function parsing available)", file=sys.stderr)
@@ -432,7 +626,13 @@ class RustFunctionFinder:
             return []
 
     def find_all_functions(self, path):
-        """Find all function names in the given path (file or directory)."""
+        """Find all function names in the given path (file or directory).
+        
+        Every finder shares one VerusParser, which memoizes the parse until a
+        source file under the path changes, so repeated lookups in one run
+        invoke verus-parser only once. The returned lists are built fresh on
+        each call.
+        """
         if self.parser is None:
             return {}
         
@@ -445,28 +645,50 @@ class RustFunctionFinder:
             print(f"Warning: Failed to parse functions: {e}", file=sys.stderr)
             return {}
 
+    def get_function_list(self, path) -> List[str]:
+        """Return the sorted, de-duplicated function names in the given path.
+        
+        Used when only names are needed, so no per-file (name, line) lists
+        are built just to be flattened again.
+        """
+        if self.parser is None:
+            return []
+        
+        try:
+            return self.parser.get_function_list(str(path), include_verus_constructs=self.include_verus_constructs)
+        except Exception as e:
+            print(f"Warning: Failed to parse functions: {e}", file=sys.stderr)
+            return []
+
     def categorize_functions_by_verification(self, path, verification_output_file):
         """Categorize functions into verified and failed based on verification output."""
-        all_functions_with_lines = self.find_all_functions(path)
-        
         parser = VerificationParser()
         errors_by_file = parser.parse_verification_output(verification_output_file)
+        return self._categorize_by_errors(path, parser, errors_by_file)
+
+    def categorize_functions_by_verification_from_string(self, path, verification_output):
+        """Categorize functions as categorize_functions_by_verification does, from in-memory output."""
+        parser = VerificationParser()
+        errors_by_file = parser.parse_verification_output_from_content(verification_output)
+        return self._categorize_by_errors(path, parser, errors_by_file)
+
+    def _categorize_by_errors(self, path, parser, errors_by_file):
+        """Return sorted (verified, failed) function names given the error lines per file."""
+        all_functions_with_lines = self.find_all_functions(path)
         
-        verified_functions = set()
+        verified_functions = _function_names(all_functions_with_lines)
         failed_functions = set()
         
-        for file_path, functions in all_functions_with_lines.items():
-            for func_name, line_number in functions:
-                verified_functions.add(func_name)
+        function_index = FunctionLineIndex(all_functions_with_lines)
         
         for file_path, error_lines in errors_by_file.items():
             for error_line in error_lines:
-                failed_func = parser.find_function_at_line(file_path, error_line, all_functions_with_lines)
+                failed_func = parser.find_function_at_line(file_path, error_line, all_functions_with_lines, function_index)
                 if failed_func:
                     failed_functions.add(failed_func)
                     verified_functions.discard(failed_func)
         
-        return sorted(list(verified_functions)), sorted(list(failed_functions))
+        return sorted(verified_functions), sorted(failed_functions)
 
 
 class VerusRunner:
@@ -520,6 +742,7 @@ class VerusRunner:
             print(f"Running: {' '.join(cmd)}")
             print(f"Working directory: {os.getcwd()}")
             
+            # Run the command and capture output
             result = subprocess.run(
                 cmd,
                 stdout=subprocess.PIPE,
@@ -547,64 +770,63 @@ class VerusAnalyzer:
         """Filter functions based on module and/or function name filters."""
         if not module_filter and not function_filter:
             return functions_set
-        
-        filtered_functions = set()
+        return functions_set & self._allowed_functions(all_functions_with_lines, module_filter, function_filter)
+    
+    def _allowed_functions(self, all_functions_with_lines: Dict[str, List[Tuple[str, int]]],
+                           module_filter: Optional[str] = None,
+                           function_filter: Optional[str] = None) -> Set[str]:
+        """Return the names of all functions that pass the module and function filters."""
+        allowed_functions = set()
         
         if module_filter:
             module_path = module_filter.replace('::', '/')
+            module_file = f"/{module_path}.rs"
+            module_dir = f"/{module_path}/"
             
         for file_path, functions in all_functions_with_lines.items():
             file_path_str = str(file_path)
             
             if module_filter:
-                if not (f"/{module_path}.rs" in file_path_str or f"/{module_path}/" in file_path_str):
+                if not (module_file in file_path_str or module_dir in file_path_str):
                     continue
             
-            for func_name, line_number in functions:
-                if func_name not in functions_set:
-                    continue
-                    
-                if function_filter and func_name != function_filter:
-                    continue
-                
-                filtered_functions.add(func_name)
+            if function_filter:
+                # Only the named function can pass, so skip the per-function loop
+                if any(func_name == function_filter for func_name, _ in functions):
+                    allowed_functions.add(function_filter)
+            else:
+                allowed_functions.update(func_name for func_name, _ in functions)
         
-        return filtered_functions
+        return allowed_functions
         
     def analyze_output(self, path, output_content, output_file=None, exit_code=None, module_filter=None, function_filter=None):
         """Comprehensive analysis of Verus verification output."""
-        compilation_errors, compilation_warnings = self.compilation_parser.parse_compilation_output(output_content)
+        # Split the output once and share the lines between the parsers
+        lines = output_content.split('\n')
+        
+        compilation_errors, compilation_warnings = self.compilation_parser.parse_compilation_output(output_content, lines)
         
         try:
             all_functions_with_lines = self.function_finder.find_all_functions(path)
-            all_function_names = set()
-            for file_path, functions in all_functions_with_lines.items():
-                for func_name, line_number in functions:
-                    all_function_names.add(func_name)
+            all_function_names = _function_names(all_functions_with_lines)
         except Exception as e:
             all_functions_with_lines = {}
             all_function_names = set()
         
-        if output_file:
-            errors_by_file = self.verification_parser.parse_verification_output(output_file)
-        else:
-            import tempfile
-            import os
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-                temp_file.write(output_content)
-                temp_file_path = temp_file.name
-            
-            errors_by_file = self.verification_parser.parse_verification_output(temp_file_path)
-            os.unlink(temp_file_path)
+        # output_content is already in memory (read from output_file if given)
+        errors_by_file = self.verification_parser.parse_verification_output_from_content(output_content, lines)
         
-        verification_failures = self.verification_parser.parse_verification_failures(output_content)
+        verification_failures = self.verification_parser.parse_verification_failures(output_content, lines)
         
         verified_functions = set(all_function_names)
         failed_functions = set()
+        function_index = FunctionLineIndex(all_functions_with_lines)
         
         for file_path, error_lines in errors_by_file.items():
             for error_line in error_lines:
-                failed_func = self.verification_parser.find_function_at_line(file_path, error_line, all_functions_with_lines)
+                failed_func = self.verification_parser.find_function_at_line(
+                    file_path, error_line, all_functions_with_lines, function_index
+                )
                 if failed_func:
                     failed_functions.add(failed_func)
                     verified_functions.discard(failed_func)
@@ -612,7 +834,7 @@ class VerusAnalyzer:
         for failure in verification_failures:
             if failure.get('file') and failure.get('line'):
                 failed_func = self.verification_parser.find_function_at_line(
-                    failure['file'], failure['line'], all_functions_with_lines
+                    failure['file'], failure['line'], all_functions_with_lines, function_index
                 )
                 if failed_func:
                     failed_functions.add(failed_func)
@@ -646,16 +868,10 @@ class VerusAnalyzer:
             status = "success"
         
         if module_filter or function_filter:
-            verified_functions = self.filter_functions_by_module_and_function(
-                all_functions_with_lines, verified_functions, module_filter, function_filter
-            )
-            failed_functions = self.filter_functions_by_module_and_function(
-                all_functions_with_lines, failed_functions, module_filter, function_filter
-            )
-            
-            all_function_names = self.filter_functions_by_module_and_function(
-                all_functions_with_lines, all_function_names, module_filter, function_filter
-            )
+            allowed_functions = self._allowed_functions(all_functions_with_lines, module_filter, function_filter)
+            verified_functions &= allowed_functions
+            failed_functions &= allowed_functions
+            all_function_names &= allowed_functions
         
         return {
             "status": status,
@@ -672,18 +888,20 @@ class VerusAnalyzer:
                 "warnings": compilation_warnings
             },
             "verification": {
-                "verified_functions": sorted(list(verified_functions)),
-                "failed_functions": sorted(list(failed_functions)),
+                "verified_functions": sorted(verified_functions),
+                "failed_functions": sorted(failed_functions),
                 "errors": verification_failures
             },
             "functions_by_file": {
-                str(file_path): [{"name": func_name, "line": line_num} for func_name, line_num in functions]
+                file_path: [{"name": func_name, "line": line_num} for func_name, line_num in functions]
                 for file_path, functions in all_functions_with_lines.items()
             }
         }
 
 
-def main():
+@functools.lru_cache(maxsize=None)
+def _build_parser():
+    """Build the command-line parser once; repeated main() calls reuse it."""
     parser = argparse.ArgumentParser(
         description='Run Verus verification and analyze results (using verus_syn parser)',
         epilog='''
@@ -720,8 +938,11 @@ Examples:
                        help='Output format (default: text)')
     parser.add_argument('--exclude-verus-constructs', action='store_true',
                        help='Exclude Verus constructs (spec, proof, exec) and only include regular functions')
-    
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    args = _build_parser().parse_args()
     
     verification_output = None
     verification_exit_code = None
@@ -743,8 +964,10 @@ Examples:
         print(f"Verification completed with exit code: {verification_exit_code}")
         print("=" * 60 + "\n")
         
-        if 'verification results::' in verification_output:
-            if ', 0 errors' in verification_output:
+        # One scan collects the error count of every results line
+        error_counts = _VERIF_SUMMARY_RE.findall(verification_output)
+        if error_counts:
+            if '0' in error_counts:
                 print("✓ Verification succeeded!")
             else:
                 print("✗ Verification failed with errors")
@@ -766,21 +989,16 @@ Examples:
                                            module_filter=args.verify_only_module, function_filter=args.verify_function)
         elif args.output_file:
             try:
-                with open(args.output_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content = _read_output_file(args.output_file)
                 result = analyzer.analyze_output(args.path, content, args.output_file, exit_code=args.exit_code,
                                                 module_filter=args.verify_only_module, function_filter=args.verify_function)
-            except (FileNotFoundError, UnicodeDecodeError, PermissionError) as e:
+            except (FileNotFoundError, PermissionError) as e:
                 print(f"Error reading output file: {e}", file=sys.stderr)
                 return 1
         else:
             finder = RustFunctionFinder(include_verus_constructs=not args.exclude_verus_constructs)
             all_functions_with_lines = finder.find_all_functions(args.path)
-            all_function_names = set()
-            
-            for file_path, functions in all_functions_with_lines.items():
-                for func_name, line_number in functions:
-                    all_function_names.add(func_name)
+            all_function_names, functions_by_file = _function_inventory(all_functions_with_lines)
             
             if args.verify_only_module or args.verify_function:
                 analyzer = VerusAnalyzer(include_verus_constructs=not args.exclude_verus_constructs)
@@ -788,63 +1006,34 @@ Examples:
                     all_functions_with_lines, all_function_names, args.verify_only_module, args.verify_function
                 )
             
-            result = {
-                "status": "functions_only",
-                "summary": {
-                    "total_functions": len(all_function_names),
-                    "verified_functions": 0,
-                    "failed_functions": 0,
-                    "compilation_errors": 0,
-                    "compilation_warnings": 0,
-                    "verification_errors": 0
-                },
-                "compilation": {
-                    "errors": [],
-                    "warnings": []
-                },
-                "verification": {
-                    "verified_functions": [],
-                    "failed_functions": [],
-                    "errors": []
-                },
-                "all_functions": sorted(list(all_function_names)),
-                "functions_by_file": {
-                    str(file_path): [{"name": func_name, "line": line_num} for func_name, line_num in functions]
-                    for file_path, functions in all_functions_with_lines.items()
-                }
-            }
+            result = _functions_only_result(sorted(all_function_names), functions_by_file)
         
         if args.json_output:
-            with open(args.json_output, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2)
+            with open(args.json_output, 'wb') as f:
+                f.write(_json_bytes(result))
             print(f"JSON output written to {args.json_output}")
         else:
-            print(json.dumps(result, indent=2))
+            sys.stdout.flush()
+            sys.stdout.buffer.write(_json_bytes(result) + b'\n')
+            sys.stdout.flush()
     
     else:
         finder = RustFunctionFinder(include_verus_constructs=not args.exclude_verus_constructs)
         
         if verification_output is not None:
-            import tempfile
-            import os
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as temp_file:
-                temp_file.write(verification_output)
-                temp_file_path = temp_file.name
+            verified_functions, failed_functions = finder.categorize_functions_by_verification_from_string(
+                args.path, verification_output
+            )
             
-            try:
-                verified_functions, failed_functions = finder.categorize_functions_by_verification(args.path, temp_file_path)
-                
-                print("=== VERIFIED FUNCTIONS ===")
-                for func_name in verified_functions:
-                    print(func_name)
+            print("=== VERIFIED FUNCTIONS ===")
+            for func_name in verified_functions:
+                print(func_name)
+            
+            print("\n=== FAILED VERIFICATION ===")
+            for func_name in failed_functions:
+                print(func_name)
                 
-                print("\n=== FAILED VERIFICATION ===")
-                for func_name in failed_functions:
-                    print(func_name)
-                    
-                print(f"\nSummary: {len(verified_functions)} verified, {len(failed_functions)} failed")
-            finally:
-                os.unlink(temp_file_path)
+            print(f"\nSummary: {len(verified_functions)} verified, {len(failed_functions)} failed")
         elif args.output_file:
             verified_functions, failed_functions = finder.categorize_functions_by_verification(args.path, args.output_file)
             
@@ -858,14 +1047,7 @@ Examples:
                 
             print(f"\nSummary: {len(verified_functions)} verified, {len(failed_functions)} failed")
         else:
-            all_functions_with_lines = finder.find_all_functions(args.path)
-            all_function_names = set()
-            
-            for file_path, functions in all_functions_with_lines.items():
-                for func_name, line_number in functions:
-                    all_function_names.add(func_name)
-            
-            for func_name in sorted(all_function_names):
+            for func_name in finder.get_function_list(args.path):
                 print(func_name)
     
     return 0
@@ -7,6 +7,7 @@ use clap::{Parser, ValueEnum};
 use serde::{Deserialize, Serialize};
 use std::collections::HashMap;
 use std::fs;
+use std::io::{BufRead, Read, Write};
 use std::path::{Path, PathBuf};
 use verus_syn::spanned::Spanned;
 use verus_syn::visit::Visit;
@@ -17,8 +18,16 @@ use walkdir::WalkDir;
 #[command(author, version, about, long_about = None)]
 struct Args {
     /// Path to search (file or directory)
-    #[arg(value_name = "PATH")]
-    path: PathBuf,
+    #[arg(value_name = "PATH", required_unless_present_any = ["files_from", "server"])]
+    path: Option<PathBuf>,
+
+    /// Parse the newline-separated list of files in FILE ("-" for stdin) instead of PATH
+    #[arg(long, value_name = "FILE", conflicts_with = "path")]
+    files_from: Option<PathBuf>,
+
+    /// Serve requests read as JSON lines from stdin, answering each with one JSON line on stdout
+    #[arg(long, conflicts_with_all = ["path", "files_from"])]
+    server: bool,
 
     /// Output format
     #[arg(short, long, value_enum, default_value = "json")]
@@ -39,6 +48,10 @@ struct Args {
     /// Show function kind (fn, spec fn, proof fn, exec fn, const fn)
     #[arg(long)]
     show_kind: bool,
+
+    /// Print JSON output on one line, without indentation
+    #[arg(long)]
+    compact: bool,
 }
 
 #[derive(Debug, Clone, ValueEnum)]
@@ -76,6 +89,31 @@ struct Summary {
     total_files: usize,
 }
 
+/// One `--server` request: the arguments of an equivalent one-shot run
+#[derive(Debug, Deserialize)]
+struct ServerRequest {
+    /// Arguments as they would follow the program name, e.g. `["src", "--format", "json"]`
+    args: Vec<String>,
+    /// Directory that relative paths are resolved against
+    #[serde(default)]
+    cwd: Option<PathBuf>,
+    /// The file list for `--files-from -`, since stdin carries the requests
+    #[serde(default)]
+    files: Option<Vec<PathBuf>>,
+}
+
+/// `--server` response for a request that failed
+#[derive(Debug, Serialize)]
+struct ServerError {
+    error: String,
+}
+
+/// `--server` response for a `--format text` request: the sorted, unique names
+#[derive(Debug, Serialize)]
+struct NamesResponse<'a> {
+    names: Vec<&'a str>,
+}
+
 /// Visitor that collects function information from an AST
 struct FunctionVisitor {
     functions: Vec<FunctionInfo>,
@@ -376,28 +414,108 @@ fn find_rust_files(path: &Path) -> Vec<PathBuf> {
         .collect()
 }
 
+/// Read newline-separated file paths from `list_path`, or from stdin when it is "-"
+fn read_file_list(list_path: &Path) -> std::io::Result<Vec<PathBuf>> {
+    let contents = if list_path == Path::new("-") {
+        let mut buf = String::new();
+        std::io::stdin().read_to_string(&mut buf)?;
+        buf
+    } else {
+        fs::read_to_string(list_path)?
+    };
+    Ok(contents
+        .lines()
+        .filter(|line| !line.is_empty())
+        .map(PathBuf::from)
+        .collect())
+}
+
+/// Parse every file in `rust_files`, collecting the results; files that fail are reported and skipped
+fn parse_files(
+    rust_files: &[PathBuf],
+    args: &Args,
+    all_functions: &mut Vec<FunctionInfo>,
+    functions_by_file: &mut HashMap<String, Vec<FunctionInfo>>,
+) {
+    for file_path in rust_files {
+        match parse_file(
+            file_path,
+            args.include_verus_constructs,
+            args.include_methods,
+            args.show_visibility,
+            args.show_kind,
+        ) {
+            Ok(functions) => {
+                if !functions.is_empty() {
+                    let path_str = file_path.to_string_lossy().to_string();
+                    functions_by_file.insert(path_str, functions.clone());
+                    all_functions.extend(functions);
+                }
+            }
+            Err(e) => {
+                eprintln!("Warning: {}", e);
+            }
+        }
+    }
+}
+
 fn main() {
     let args = Args::parse();
 
-    if !args.path.exists() {
-        eprintln!("Error: Path does not exist: {}", args.path.display());
-        std::process::exit(1);
+    if args.server {
+        if let Err(e) = run_server() {
+            eprintln!("Error: {}", e);
+            std::process::exit(1);
+        }
+        return;
     }
 
+    match collect_functions(&args, None) {
+        Ok(output) => print_output(&args, &output),
+        Err(e) => {
+            eprintln!("{}", e);
+            std::process::exit(1);
+        }
+    }
+}
+
+/// Collect the functions selected by `args`.
+///
+/// `file_list`, when given, replaces reading the `--files-from` list.
+fn collect_functions(args: &Args, file_list: Option<Vec<PathBuf>>) -> Result<ParsedOutput, String> {
     let mut all_functions = Vec::new();
     let mut functions_by_file: HashMap<String, Vec<FunctionInfo>> = HashMap::new();
     let mut total_files = 0;
 
-    if args.path.is_file() {
+    // One invocation can parse a whole batch of files listed by the caller
+    if let Some(ref list_path) = args.files_from {
+        let rust_files = match file_list {
+            Some(files) => files,
+            None => read_file_list(list_path).map_err(|e| {
+                format!("Error: Failed to read file list {}: {}", list_path.display(), e)
+            })?,
+        };
+        total_files = rust_files.len();
+        parse_files(&rust_files, args, &mut all_functions, &mut functions_by_file);
+        return Ok(build_output(all_functions, functions_by_file, total_files));
+    }
+
+    let path = args.path.as_ref().expect("PATH is required without --files-from");
+
+    if !path.exists() {
+        return Err(format!("Error: Path does not exist: {}", path.display()));
+    }
+
+    if path.is_file() {
         match parse_file(
-            &args.path,
+            path,
             args.include_verus_constructs,
             args.include_methods,
             args.show_visibility,
             args.show_kind,
         ) {
             Ok(functions) => {
-                let file_path = args.path.to_string_lossy().to_string();
+                let file_path = path.to_string_lossy().to_string();
                 if !functions.is_empty() {
                     functions_by_file.insert(file_path, functions.clone());
                     all_functions.extend(functions);
@@ -405,59 +523,113 @@ fn main() {
                 }
             }
             Err(e) => {
-                eprintln!("Error parsing file: {}", e);
-                std::process::exit(1);
+                return Err(format!("Error parsing file: {}", e));
             }
         }
     } else {
-        let rust_files = find_rust_files(&args.path);
+        let rust_files = find_rust_files(path);
         total_files = rust_files.len();
+        parse_files(&rust_files, args, &mut all_functions, &mut functions_by_file);
+    }
 
-        for file_path in rust_files {
-            match parse_file(
-                &file_path,
-                args.include_verus_constructs,
-                args.include_methods,
-                args.show_visibility,
-                args.show_kind,
-            ) {
-                Ok(functions) => {
-                    if !functions.is_empty() {
-                        let path_str = file_path.to_string_lossy().to_string();
-                        functions_by_file.insert(path_str, functions.clone());
-                        all_functions.extend(functions);
-                    }
-                }
-                Err(e) => {
-                    eprintln!("Warning: {}", e);
-                }
-            }
+    Ok(build_output(all_functions, functions_by_file, total_files))
+}
+
+fn build_output(
+    all_functions: Vec<FunctionInfo>,
+    functions_by_file: HashMap<String, Vec<FunctionInfo>>,
+    total_files: usize,
+) -> ParsedOutput {
+    let total_functions = all_functions.len();
+    ParsedOutput {
+        functions: all_functions,
+        functions_by_file,
+        summary: Summary {
+            total_functions,
+            total_files,
+        },
+    }
+}
+
+/// Answer requests from stdin until it is closed, so one process serves many parses.
+///
+/// Each response is a single line of JSON: `{"names": [...]}` for a
+/// `--format text` request, otherwise the `--format json` output of the
+/// request, or `{"error": ...}` if it failed.
+fn run_server() -> std::io::Result<()> {
+    let stdin = std::io::stdin();
+    let stdout = std::io::stdout();
+    let mut out = std::io::BufWriter::new(stdout.lock());
+
+    for line in stdin.lock().lines() {
+        let line = line?;
+        if line.trim().is_empty() {
+            continue;
         }
+        let response = match handle_request(&line) {
+            Ok((OutputFormat::Text, output)) => serde_json::to_string(&NamesResponse {
+                names: unique_names(&output.functions),
+            }),
+            Ok((_, output)) => serde_json::to_string(&output),
+            Err(error) => serde_json::to_string(&ServerError { error }),
+        }
+        .expect("server responses always serialize");
+        writeln!(out, "{}", response)?;
+        out.flush()?;
+    }
+    Ok(())
+}
+
+/// Run one `--server` request through the same code path as a one-shot invocation
+fn handle_request(line: &str) -> Result<(OutputFormat, ParsedOutput), String> {
+    let request: ServerRequest =
+        serde_json::from_str(line).map_err(|e| format!("Error: Invalid request: {}", e))?;
+    let args = Args::try_parse_from(std::iter::once("verus-parser".to_string()).chain(request.args))
+        .map_err(|e| e.to_string())?;
+    if args.server {
+        return Err("Error: --server is not valid inside a request".to_string());
     }
+    if let Some(ref cwd) = request.cwd {
+        std::env::set_current_dir(cwd)
+            .map_err(|e| format!("Error: Failed to change directory to {}: {}", cwd.display(), e))?;
+    }
+    let file_list = match args.files_from {
+        Some(ref list_path) if list_path.as_path() == Path::new("-") => {
+            Some(request.files.unwrap_or_default())
+        }
+        _ => None,
+    };
+    let output = collect_functions(&args, file_list)?;
+    Ok((args.format, output))
+}
+
+/// Sorted function names with duplicates removed
+fn unique_names(functions: &[FunctionInfo]) -> Vec<&str> {
+    let mut names: Vec<_> = functions.iter().map(|f| f.name.as_str()).collect();
+    names.sort();
+    names.dedup();
+    names
+}
 
+/// Print the collected functions in the requested output format
+fn print_output(args: &Args, output: &ParsedOutput) {
     match args.format {
         OutputFormat::Json => {
-            let output = ParsedOutput {
-                functions: all_functions.clone(),
-                functions_by_file,
-                summary: Summary {
-                    total_functions: all_functions.len(),
-                    total_files,
-                },
+            let json = if args.compact {
+                serde_json::to_string(output)
+            } else {
+                serde_json::to_string_pretty(output)
             };
-            println!("{}", serde_json::to_string_pretty(&output).unwrap());
+            println!("{}", json.unwrap());
         }
         OutputFormat::Text => {
             // Just print function names, one per line
-            let mut names: Vec<_> = all_functions.iter().map(|f| f.name.as_str()).collect();
-            names.sort();
-            names.dedup();
-            for name in names {
+            for name in unique_names(&output.functions) {
                 println!("{}", name);
             }
         }
         OutputFormat::Detailed => {
-            for func in &all_functions {
+            for func in &output.functions {
                 print!("{}", func.name);
                 if let Some(ref kind) = func.kind {
                     print!(" [{}]", kind);
@@ -473,7 +645,10 @@ fn main() {
                 }
                 println!();
             }
-            println!("\nSummary: {} functions in {} files", all_functions.len(), total_files);
+            println!(
+                "\nSummary: {} functions in {} files",
+                output.summary.total_functions, output.summary.total_files
+            );
         }
     }
 }
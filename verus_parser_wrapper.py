@@ -4,11 +4,158 @@ Wrapper for the Rust-based verus-parser that uses verus_syn.
 This provides a Python interface to the more accurate parsing logic.
 """
 
+import atexit
+import functools
 import json
+import os
 import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+# orjson is optional; it decodes the parser's (potentially multi-MB) JSON
+# output straight from bytes
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Recent parse_functions results, most recently used last
+_PARSE_CACHE: "OrderedDict[tuple, Dict]" = OrderedDict()
+_PARSE_CACHE_SIZE = 32
+
+# Directories with at least this many .rs files are split across several
+# verus-parser processes; below it, process start-up outweighs the gain
+_PARALLEL_MIN_FILES = 50
+
+
+@functools.lru_cache(maxsize=1)
+def _discover_binary() -> str:
+    """
+    Return the first verus-parser binary found in the usual build locations.
+    
+    The result is cached for the life of the process. A failed search raises
+    FileNotFoundError and is not cached, so a binary built later is found.
+    """
+    here = Path(__file__).parent
+    possible_paths = [
+        here / "verus-parser-bin",
+        here / "verus-parser" / "target" / "release" / "verus-parser",
+        here / "verus-parser" / "target" / "debug" / "verus-parser",
+    ]
+    
+    for path in possible_paths:
+        if os.path.isfile(path):
+            return str(path)
+    
+    raise FileNotFoundError(
+        "verus-parser binary not found. Please build it first using:\n"
+        "  cd verus-parser && cargo build --release"
+    )
+
+
+def _encode_json(obj) -> bytes:
+    """Serialize obj as compact JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # e.g. surrogate-escaped non-UTF-8 paths, which json.dumps escapes
+            pass
+    return json.dumps(obj).encode("utf-8")
+
+
+def _encode_json_pretty(obj) -> bytes:
+    """Serialize obj as 2-space indented JSON bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _decode_json(data: bytes):
+    """Parse JSON from bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _cache_get(key: tuple):
+    """Return the memoized result for key, marking it most recently used; None if absent."""
+    value = _PARSE_CACHE.get(key)
+    if value is not None:
+        _PARSE_CACHE.move_to_end(key)
+    return value
+
+
+def _cache_put(key: tuple, value) -> None:
+    """Memoize value under key, evicting the least recently used entry when full."""
+    _PARSE_CACHE[key] = value
+    if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+        _PARSE_CACHE.popitem(last=False)
+
+
+def _find_rust_files(path: str) -> List[str]:
+    """
+    List the .rs paths at or under directory path, as verus-parser's own
+    directory walk would: depth-first, without following symlinked directories.
+    """
+    rust_files = []
+    
+    def walk(directory):
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.name.endswith(".rs"):
+                rust_files.append(entry.path)
+            if entry.is_dir(follow_symlinks=False):
+                walk(entry.path)
+    
+    if path.endswith(".rs"):
+        rust_files.append(path)
+    walk(path)
+    return rust_files
+
+
+def _tree_mtime(path: str) -> int:
+    """
+    Return the newest st_mtime_ns of path and, for a directory, everything the
+    parser reads under it.
+    
+    Directory mtimes are included so that adding or removing a file also
+    changes the result. Symlinked directories are not followed, matching
+    _find_rust_files. Raises OSError if path does not exist.
+    """
+    newest = os.stat(path).st_mtime_ns
+    pending = [path] if os.path.isdir(path) else []
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                entries = list(entries)
+        except OSError:
+            # verus-parser skips unreadable directories too
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif not entry.name.endswith(".rs"):
+                    continue
+                newest = max(newest, entry.stat().st_mtime_ns)
+            except OSError:
+                continue
+    return newest
+
 
 class VerusParser:
     """Wrapper for the Rust verus-parser binary."""
@@ -21,26 +168,19 @@ class VerusParser:
             binary_path: Path to the verus-parser binary. If None, searches in common locations.
         """
         if binary_path is None:
-            # Try to find the binary in common locations
-            possible_paths = [
-                Path(__file__).parent / "verus-parser-bin",
-                Path(__file__).parent / "verus-parser" / "target" / "release" / "verus-parser",
-                Path(__file__).parent / "verus-parser" / "target" / "debug" / "verus-parser",
-            ]
-            
-            for path in possible_paths:
-                if path.exists():
-                    binary_path = str(path)
-                    break
-            else:
-                raise FileNotFoundError(
-                    "verus-parser binary not found. Please build it first using:\n"
-                    "  cd verus-parser && cargo build --release"
-                )
+            binary_path = _discover_binary()
+        elif not os.path.exists(binary_path):
+            raise FileNotFoundError(f"verus-parser binary not found at: {binary_path}")
         
         self.binary_path = Path(binary_path)
-        if not self.binary_path.exists():
-            raise FileNotFoundError(f"verus-parser binary not found at: {self.binary_path}")
+        
+        # Long-lived `verus-parser --server` process, started on first use
+        self._server = None
+        self._server_supported = None
+        self._server_lock = threading.Lock()
+        self._atexit_registered = False
+        # `verus-parser --help` output, read once to detect optional flags
+        self._help_text = None
     
     def parse_functions(
         self, 
@@ -61,32 +201,274 @@ class VerusParser:
             show_kind: Include function kind (fn, spec fn, proof fn, etc.)
             
         Returns:
-            Dictionary with parsed function information
+            Dictionary with parsed function information. Results are memoized
+            until a source file under path changes, so the returned dictionary
+            is shared and must not be modified.
         """
-        cmd = [str(self.binary_path), path, "--format", "json"]
+        # Accept pathlib.Path too; requests to the server are JSON-encoded
+        path = os.fspath(path)
+        flag_args = self._flag_args(
+            include_verus_constructs, include_methods, show_visibility, show_kind
+        )
+        args = [path] + flag_args
+        
+        try:
+            key = self._cache_key(path, include_verus_constructs, include_methods, show_visibility, show_kind)
+        except OSError:
+            # Nothing to key on; let verus-parser report the problem
+            return self._run_json(args)
+        
+        data = _cache_get(key)
+        if data is not None:
+            return data
+        
+        data = None
+        if os.path.isdir(path):
+            data = self._parse_tree_parallel(path, flag_args)
+        if data is None:
+            data = self._run_json(args)
+        _cache_put(key, data)
+        return data
+    
+    def parse_files(
+        self,
+        file_paths: List[str],
+        include_verus_constructs: bool = True,
+        include_methods: bool = True,
+        show_visibility: bool = False,
+        show_kind: bool = False
+    ) -> Dict:
+        """
+        Parse functions from an explicit list of files in a single verus-parser run.
+        
+        The paths are passed as the --files-from - list, so the whole batch is
+        a single verus-parser request no matter how many files it contains.
+        A binary without --files-from is run once per file instead.
+        
+        Args:
+            file_paths: Paths of the .rs files to parse
+            include_verus_constructs: Include spec, proof, exec functions
+            include_methods: Include trait and impl methods
+            show_visibility: Include visibility information (pub/private)
+            show_kind: Include function kind (fn, spec fn, proof fn, etc.)
+            
+        Returns:
+            Dictionary with parsed function information, as for parse_functions
+        """
+        flag_args = self._flag_args(
+            include_verus_constructs, include_methods, show_visibility, show_kind
+        )
+        files = [os.fspath(file_path) for file_path in file_paths]
+        if not self._supports_flag("--files-from"):
+            # Older builds take one PATH per run; skip files that fail, as
+            # --files-from does
+            parts = []
+            for file_path in files:
+                try:
+                    parts.append(self._run_json([file_path] + flag_args))
+                except RuntimeError:
+                    continue
+            return self._merge_results(parts, len(files))
+        return self._run_json(["--files-from", "-"] + flag_args, files=files)
+    
+    def _parse_tree_parallel(self, path: str, flag_args: List[str]) -> Optional[Dict]:
+        """
+        Parse a large directory with one verus-parser process per CPU.
+        
+        Each process parses a contiguous share of the tree's .rs files via
+        --files-from -, and the results are merged in file order. Returns None
+        when the tree is too small, or there is only one CPU, to be worth it,
+        or when the binary predates --files-from.
+        
+        These are one-shot processes rather than requests to the --server
+        process on purpose: a single server parses one request at a time, so
+        it can't spread the work across CPUs.
+        """
+        workers = os.cpu_count() or 1
+        if workers < 2:
+            return None
+        if not self._supports_flag("--files-from"):
+            return None
+        rust_files = _find_rust_files(path)
+        if len(rust_files) < _PARALLEL_MIN_FILES:
+            return None
+        
+        chunk_size = -(-len(rust_files) // workers)
+        chunks = [rust_files[i:i + chunk_size] for i in range(0, len(rust_files), chunk_size)]
+        cmd = [str(self.binary_path), "--files-from", "-"] + flag_args
+        if self._supports_flag("--compact"):
+            # Skip the indentation of pretty-printed JSON; only this process reads it
+            cmd.append("--compact")
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            parts = list(executor.map(
+                lambda chunk: self._run_once(cmd, "".join(f"{file_path}\n" for file_path in chunk)),
+                chunks
+            ))
+        return self._merge_results(parts, len(rust_files))
+    
+    @staticmethod
+    def _merge_results(parts: List[Dict], total_files: int) -> Dict:
+        """Combine the JSON outputs of several runs, each over different files, in order."""
+        functions = []
+        functions_by_file = {}
+        for part in parts:
+            functions.extend(part["functions"])
+            functions_by_file.update(part["functions_by_file"])
+        return {
+            "functions": functions,
+            "functions_by_file": functions_by_file,
+            "summary": {
+                "total_functions": len(functions),
+                "total_files": total_files,
+            },
+        }
+    
+    def _cache_key(self, path, include_verus_constructs, include_methods, show_visibility, show_kind) -> tuple:
+        """Memo key for a parse of path; raises OSError if path cannot be stat'ed."""
+        return (str(self.binary_path), os.path.realpath(path), include_verus_constructs,
+                include_methods, show_visibility, show_kind, _tree_mtime(path))
+    
+    @staticmethod
+    def _flag_args(include_verus_constructs, include_methods, show_visibility, show_kind,
+                   output_format: str = "json") -> List[str]:
+        """Build the output-format and filter arguments shared by every invocation."""
+        args = ["--format", output_format]
         
         if include_verus_constructs:
-            cmd.append("--include-verus-constructs")
+            args.append("--include-verus-constructs")
         
         if include_methods:
-            cmd.append("--include-methods")
+            args.append("--include-methods")
         
         if show_visibility:
-            cmd.append("--show-visibility")
+            args.append("--show-visibility")
         
         if show_kind:
-            cmd.append("--show-kind")
+            args.append("--show-kind")
+        
+        return args
+    
+    def _run_json(self, args: List[str], files: Optional[List[str]] = None) -> Dict:
+        """
+        Run verus-parser with the given arguments and decode its JSON output.
+        
+        The request goes to the long-lived server process when the binary
+        supports --server; otherwise (or if the server has died) a new process
+        is started for this call alone. files is the --files-from - list.
+        """
+        data = self._request_server(args, files)
+        if data is not None:
+            return data
         
+        stdin = "".join(f"{file_path}\n" for file_path in files) if files is not None else None
+        return self._run_once([str(self.binary_path)] + args, stdin)
+    
+    def _run_names(self, args: List[str]) -> List[str]:
+        """Run a --format text request (via the server if possible) and return its names."""
+        data = self._request_server(args)
+        if data is not None:
+            return data["names"]
+        return self._run_once([str(self.binary_path)] + args, text=True)
+    
+    def _request_server(self, args: List[str], files: Optional[List[str]] = None) -> Optional[Dict]:
+        """Send one request to the server; None if there is no usable server."""
+        with self._server_lock:
+            server = self._ensure_server()
+            if server is not None:
+                request = {"args": args, "cwd": os.getcwd()}
+                if files is not None:
+                    request["files"] = files
+                try:
+                    server.stdin.write(_encode_json(request) + b"\n")
+                    server.stdin.flush()
+                    response = server.stdout.readline()
+                except OSError:
+                    response = b""
+                if not response:
+                    # Don't keep restarting a server that exits under us
+                    self._stop_server()
+                    self._server_supported = False
+            else:
+                response = None
+        
+        if response:
+            try:
+                data = _decode_json(response)
+            except json.JSONDecodeError as e:
+                raise RuntimeError(f"Failed to parse verus-parser output: {e}")
+            if "error" in data:
+                raise RuntimeError(f"verus-parser failed: {data['error']}")
+            return data
+        return None
+    
+    def _ensure_server(self):
+        """Return the running server process, starting it if needed; None if --server is unsupported."""
+        if self._server is not None and self._server.poll() is None:
+            return self._server
+        if self._server_supported is None:
+            self._server_supported = self._supports_flag("--server")
+        if not self._server_supported:
+            return None
+        
+        self._server = subprocess.Popen(
+            [str(self.binary_path), "--server"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=1 << 16
+        )
+        if not self._atexit_registered:
+            # One handler per instance, covering whichever server is current at exit
+            atexit.register(self._terminate_server)
+            self._atexit_registered = True
+        return self._server
+    
+    def _supports_flag(self, flag: str) -> bool:
+        """Check whether this verus-parser build accepts flag (e.g. older builds lack --server)."""
+        if self._help_text is None:
+            try:
+                result = subprocess.run(
+                    [str(self.binary_path), "--help"],
+                    capture_output=True,
+                    timeout=30
+                )
+                self._help_text = result.stdout if result.returncode == 0 else b""
+            except (OSError, subprocess.SubprocessError):
+                self._help_text = b""
+        return flag.encode("utf-8") in self._help_text
+    
+    def _terminate_server(self):
+        """Signal the current server process, if any, to exit."""
+        if self._server is not None:
+            self._server.terminate()
+    
+    def _stop_server(self):
+        """Terminate the server process, if any."""
+        if self._server is not None:
+            self._server.terminate()
+            self._server.wait()
+            self._server = None
+    
+    @staticmethod
+    def _run_once(cmd: List[str], stdin: Optional[str] = None, text: bool = False):
+        """
+        Run verus-parser as a one-shot process and decode its JSON output, or
+        with text=True return its output lines (the --format text names).
+        """
         try:
+            # Capture raw bytes: the JSON is parsed directly from them instead
+            # of first being decoded into an intermediate str
             result = subprocess.run(
                 cmd,
+                input=stdin.encode("utf-8") if stdin is not None else None,
                 capture_output=True,
-                text=True,
                 check=True
             )
-            return json.loads(result.stdout)
+            if text:
+                return result.stdout.decode("utf-8").splitlines()
+            return _decode_json(result.stdout)
         except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"verus-parser failed: {e.stderr}")
+            raise RuntimeError(f"verus-parser failed: {e.stderr.decode('utf-8', errors='replace')}")
         except json.JSONDecodeError as e:
             raise RuntimeError(f"Failed to parse verus-parser output: {e}")
     
@@ -120,13 +502,33 @@ class VerusParser:
         Returns:
             Sorted list of unique function names
         """
-        data = self.parse_functions(path, include_verus_constructs=include_verus_constructs)
-        names = {func["name"] for func in data["functions"]}
-        return sorted(names)
+        path = os.fspath(path)
+        # Reuse a memoized full parse of the same tree if there is one, as
+        # parse_functions(path, include_verus_constructs=...) would return
+        try:
+            key = self._cache_key(path, include_verus_constructs, True, False, False)
+        except OSError:
+            key = None
+        if key is not None:
+            data = _cache_get(key)
+            if data is not None:
+                return sorted(set(map(itemgetter("name"), data["functions"])))
+            names = _cache_get(key + ("names",))
+            if names is not None:
+                return list(names)
+        
+        # Otherwise ask verus-parser for the names alone (--format text), so
+        # the full function records are neither produced nor decoded
+        args = [path] + self._flag_args(include_verus_constructs, True, False, False, output_format="text")
+        names = self._run_names(args)
+        if key is not None:
+            _cache_put(key + ("names",), names)
+        return list(names)
 
 
-def main():
-    """Command-line interface for the parser wrapper."""
+@functools.lru_cache(maxsize=None)
+def _build_parser():
+    """Build the command-line parser once; repeated main() calls reuse it."""
     import argparse
     
     parser = argparse.ArgumentParser(
@@ -160,8 +562,12 @@ def main():
         default="json",
         help="Output format"
     )
-    
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Command-line interface for the parser wrapper."""
+    args = _build_parser().parse_args()
     
     try:
         verus_parser = VerusParser(binary_path=args.binary_path)
@@ -185,7 +591,7 @@ def main():
             )
             
             if args.format == "json":
-                print(json.dumps(data, indent=2))
+                sys.stdout.buffer.write(_encode_json_pretty(data) + b"\n")
             else:  # text
                 for func in data["functions"]:
                     print(f"{func['name']} @ {func['file']}:{func['start_line']}")